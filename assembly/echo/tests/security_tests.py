@@ -28,14 +28,22 @@ TEST CATEGORIES:
 
 import os
 import sys
+import json
+import mmap
+import hashlib
+import shlex
 import subprocess
 import struct
+import select
 import signal
 import time
 import random
 import string
 import tempfile
 import resource
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from shutil import which
 
@@ -46,8 +54,26 @@ from shutil import which
 TIMEOUT = 5
 BIN = ""
 GNU = "/usr/bin/echo"
+# Python ignores SIGPIPE/SIGXFSZ; like Popen(restore_signals=True), reset them in spawned children
+RESTORE_SIGNALS = (signal.SIGPIPE, signal.SIGXFSZ)
+HEAD = which("head") or "/usr/bin/head"
+BATCH_SIZE = 32
+BATCH_SEP = b"\0__SEP__"
+REPL_END = b"\0__END__"
+# Each stdin line is a shell-quoted command, answered with its stdout + framed status;
+# its stderr goes to the file named by $0, read back once the status arrives
+REPL_SCRIPT = ('while IFS= read -r line; do eval "$line" </dev/null 2>"$0"; '
+               'printf \'\\000__END__%d\\000\' $?; done')
+# bash exports its own _ and a bumped SHLVL to what it runs; env(1) restores the harness's
+REPL_ENV = ([which("env") or "/usr/bin/env", "-u", "_", "-u", "SHLVL"]
+            + [f"{k}={os.environ[k]}" for k in ("_", "SHLVL") if k in os.environ])
 LOG_EVERY = 1
 
+# Opt-in replay of strace-backed results for an unchanged binary (keyed by SHA-256)
+CACHE_ENABLED = os.environ.get("FECHO_TESTS_CACHE") == "1"
+CACHE_DIR = Path.home() / ".cache" / "fecho_tests"
+BIN_HASH = ""
+
 # =============================================================================
 #                           TEST HARNESS
 # =============================================================================
@@ -56,37 +82,57 @@ failures = []
 test_count = 0
 pass_count = 0
 skip_count = 0
+gnu_cache = {}  # tuple(args) -> (rc, out) from GNU echo; deterministic for a run
+_repl = None
+_repl_err = None  # stderr capture file of the running REPL
+_repl_lock = threading.Lock()
+
+# Sections run on a thread pool: counters are locked, and each thread buffers
+# its own log lines (and cache recordings) until its section finishes.
+_lock = threading.Lock()
+_local = threading.local()
 
 
 def log(msg):
-    print(msg, flush=True)
+    lines = getattr(_local, "lines", None)
+    if lines is not None:
+        lines.append(msg)
+    else:
+        print(msg, flush=True)
 
 
 def report_result(ok, label):
     global test_count, pass_count
-    test_count += 1
+    with _lock:
+        test_count += 1
+        if ok:
+            pass_count += 1
     if ok:
-        pass_count += 1
         if LOG_EVERY:
             log(f"[PASS] {label}")
     else:
         log(f"[FAIL] {label}")
+    recorded = getattr(_local, "recorded", None)
+    if recorded is not None:
+        recorded.append((bool(ok), label))
 
 
 def report_skip(label):
     global skip_count, test_count, pass_count
-    test_count += 1
-    skip_count += 1
-    pass_count += 1
+    with _lock:
+        test_count += 1
+        skip_count += 1
+        pass_count += 1
     log(f"[SKIP] {label}")
 
 
 def record_failure(category, details):
-    failures.append({"category": category, "details": details})
+    with _lock:
+        failures.append({"category": category, "details": details})
 
 
 def find_binary():
-    global BIN
+    global BIN, BIN_HASH
     script_dir = Path(__file__).resolve().parent
     candidate = script_dir.parent / "fecho"
     if candidate.exists():
@@ -95,6 +141,51 @@ def find_binary():
         log(f"[ERROR] Binary not found: {candidate}")
         sys.exit(2)
     log(f"Binary: {BIN}")
+    if CACHE_ENABLED:
+        BIN_HASH = fingerprint(BIN)
+        log(f"Cache: {CACHE_DIR} ({BIN_HASH[:12]})")
+
+
+def fingerprint(path):
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        return hashlib.sha256(m).hexdigest()
+
+
+def run_cached(section, fn):
+    """Replay section results cached for this binary hash, or run fn and cache a clean pass."""
+    if not BIN_HASH:
+        fn()
+        return
+    path = CACHE_DIR / f"{BIN_HASH}-{section}.json"
+    try:
+        cached = json.loads(path.read_text())
+    except (OSError, ValueError):
+        cached = None
+    if cached:
+        for ok, label in cached:
+            report_result(ok, f"{label} (cached)")
+        return
+    _local.recorded = []
+    try:
+        fn()
+    finally:
+        results, _local.recorded = _local.recorded, None
+    if results and all(ok for ok, _ in results):
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(results))
+        except OSError:
+            pass
+
+
+@lru_cache(maxsize=None)
+def gnu_available():
+    return os.path.exists(GNU)
+
+
+@lru_cache(maxsize=None)
+def have_strace():
+    return which("strace") is not None
 
 
 def run(cmd, stdin_data=None, env=None, preexec_fn=None, timeout=None):
@@ -120,12 +211,196 @@ def run(cmd, stdin_data=None, env=None, preexec_fn=None, timeout=None):
     return (p.returncode, out, err)
 
 
+def run_batch(cases, binary=None, timeout=None):
+    """Run [binary] + args (default BIN) for each case inside one bash process.
+
+    Each invocation is followed by a NUL-framed separator carrying its exit
+    status, so the combined stdout splits back into one (rc, out) per case.
+    Cases are flushed BATCH_SIZE at a time to keep the script small.
+    """
+    if binary is None:
+        binary = BIN
+    results = []
+    for i in range(0, len(cases), BATCH_SIZE):
+        chunk = cases[i:i + BATCH_SIZE]
+        script = "".join(f"{shlex.join([binary] + args)}; printf '\\000__SEP__%d\\000' $?\n"
+                         for args in chunk)
+        _, out, _ = run(["bash", "-c", script], timeout=timeout)
+        parts = out.split(BATCH_SEP)
+        body = parts[0]
+        for part in parts[1:]:
+            status, _, rest = part.partition(b"\0")
+            results.append((int(status or 124), body))
+            body = rest
+        # A killed batch loses its remaining cases; report them as timeouts
+        results.extend((124, b"") for _ in range(i + len(chunk) - len(results)))
+    return results
+
+
+def run_persistent(args, timeout=None):
+    """Run [BIN] + args via one long-lived bash REPL instead of a fresh spawn per case.
+
+    Args that cannot travel on a single line fall back to run(). The command
+    sees the harness's environment, and stderr is captured like run()'s.
+    """
+    global _repl, _repl_err
+    if any("\n" in a or "\0" in a for a in args):
+        return run([BIN] + args, timeout=timeout)
+    if timeout is None:
+        timeout = TIMEOUT
+    with _repl_lock:
+        if _repl is None:
+            fd, _repl_err = tempfile.mkstemp(prefix="fecho_repl_")
+            os.close(fd)
+            _repl = subprocess.Popen(["bash", "-c", REPL_SCRIPT, _repl_err], stdin=subprocess.PIPE,
+                                     stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        p = _repl
+        buf = b""
+        try:
+            p.stdin.write(shlex.join(REPL_ENV + [BIN] + args).encode() + b"\n")
+            p.stdin.flush()
+            fd = p.stdout.fileno()
+            deadline = time.monotonic() + timeout
+            while True:
+                end = buf.find(REPL_END)
+                if end >= 0:
+                    term = buf.find(b"\0", end + len(REPL_END))
+                    if term >= 0:
+                        with open(_repl_err, "rb") as f:
+                            err = f.read()
+                        return (int(buf[end + len(REPL_END):term]), buf[:end], err)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                    break
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    break
+                buf += chunk
+        except OSError:
+            pass
+        # Hung or dead REPL: discard it so the next call starts a fresh one
+        p.kill()
+        p.wait()
+        _repl = None
+        _discard_repl_err()
+        return (124, buf, b"")
+
+
+def _discard_repl_err():
+    global _repl_err
+    if _repl_err is not None:
+        try:
+            os.unlink(_repl_err)
+        except OSError:
+            pass
+        _repl_err = None
+
+
+def close_persistent():
+    global _repl
+    with _repl_lock:
+        if _repl is not None:
+            _repl.stdin.close()
+            _repl.wait()
+            _repl = None
+        _discard_repl_err()
+
+
+def spawn_pipeline(cmds):
+    """Spawn cmds connected stdout→stdin without a shell; other stdio goes to /dev/null."""
+    pids = []
+    prev_r = None
+    for i, cmd in enumerate(cmds):
+        actions = [(os.POSIX_SPAWN_OPEN, 2, os.devnull, os.O_WRONLY, 0)]
+        if prev_r is None:
+            actions.append((os.POSIX_SPAWN_OPEN, 0, os.devnull, os.O_RDONLY, 0))
+        else:
+            actions.append((os.POSIX_SPAWN_DUP2, prev_r, 0))
+        r = w = None
+        if i < len(cmds) - 1:
+            r, w = os.pipe2(os.O_CLOEXEC)
+            actions.append((os.POSIX_SPAWN_DUP2, w, 1))
+        else:
+            actions.append((os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0))
+        try:
+            pids.append(os.posix_spawn(cmd[0], cmd, os.environ, file_actions=actions,
+                                       setsigdef=RESTORE_SIGNALS))
+        except OSError:
+            if r is not None:
+                os.close(r)
+            r = None
+            break
+        finally:
+            if prev_r is not None:
+                os.close(prev_r)
+                prev_r = None
+            if w is not None:
+                os.close(w)
+        prev_r = r
+    if prev_r is not None:
+        os.close(prev_r)
+    return pids
+
+
+def wait_pids(pids, timeout=None):
+    """Reap pids via pidfd + epoll. Returns {pid: wait status}, None for killed stragglers."""
+    if timeout is None:
+        timeout = TIMEOUT
+    statuses = {}
+    pending = {}
+    with select.epoll() as ep:
+        for pid in pids:
+            fd = os.pidfd_open(pid)
+            pending[fd] = pid
+            ep.register(fd, select.EPOLLIN)
+        deadline = time.monotonic() + timeout
+        while pending:
+            remaining = deadline - time.monotonic()
+            events = ep.poll(remaining) if remaining > 0 else []
+            if not events:
+                break
+            for fd, _ in events:
+                pid = pending.pop(fd)
+                ep.unregister(fd)
+                os.close(fd)
+                statuses[pid] = os.waitpid(pid, 0)[1]
+    for fd, pid in pending.items():
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+        os.close(fd)
+        statuses[pid] = None
+    return statuses
+
+
+def prime_gnu_cache(cases):
+    """Capture GNU echo results for every argv not yet in gnu_cache with one batched run."""
+    missing = [list(key) for key in dict.fromkeys(map(tuple, cases)) if key not in gnu_cache]
+    for args, result in zip(missing, run_batch(missing, binary=GNU)):
+        gnu_cache[tuple(args)] = result
+
+
 def compare_with_gnu(args, label=None):
     """Compare fecho output with GNU echo for the given args."""
-    if not os.path.exists(GNU):
+    if not gnu_available():
+        return
+    rc_f, out_f, _ = run_persistent(args)
+    key = tuple(args)
+    if key not in gnu_cache:
+        rc_g, out_g, _ = run([GNU] + args)
+        gnu_cache[key] = (rc_g, out_g)
+    report_comparison(args, rc_f, out_f, *gnu_cache[key], label)
+
+
+def compare_many_with_gnu(cases):
+    """compare_with_gnu for many argvs: GNU results come from one batched run."""
+    if not gnu_available():
         return
-    rc_f, out_f, err_f = run([BIN] + args)
-    rc_g, out_g, err_g = run([GNU] + args)
+    prime_gnu_cache(cases)
+    for args in cases:
+        compare_with_gnu(args)
+
+
+def report_comparison(args, rc_f, out_f, rc_g, out_g, label=None):
     # Normalize program name in output (our binary path vs GNU path)
     out_f_norm = out_f.replace(BIN.encode(), b"echo")
     out_g_norm = out_g.replace(GNU.encode(), b"echo")
@@ -234,7 +509,11 @@ def check_strings_leaks():
 
 def check_syscall_surface():
     log("\n=== Syscall Surface Analysis ===")
-    if not which("strace"):
+    run_cached("syscall", _syscall_surface)
+
+
+def _syscall_surface():
+    if not have_strace():
         report_skip("syscall: strace not available")
         return
 
@@ -395,8 +674,15 @@ def check_signal_safety():
     ok_count = 0
     trials = 20
     for _ in range(trials):
-        rc = os.system(f"{BIN} hello 2>/dev/null | head -c 0 >/dev/null 2>/dev/null")
-        if rc == 0:
+        pids = spawn_pipeline([[BIN, "hello"], [HEAD, "-c", "0"]])
+        statuses = wait_pids(pids)
+        if len(pids) != 2:
+            continue
+        bin_st, head_st = statuses[pids[0]], statuses[pids[1]]
+        # fecho may exit or die of SIGPIPE once head closes the pipe; anything else is a crash
+        bin_ok = bin_st is not None and (
+            not os.WIFSIGNALED(bin_st) or os.WTERMSIG(bin_st) == signal.SIGPIPE)
+        if bin_ok and head_st == 0:
             ok_count += 1
     report_result(ok_count >= trials - 2, f"signal: rapid SIGPIPE ({ok_count}/{trials})")
 
@@ -568,7 +854,9 @@ def check_output_integrity():
     report_result(out == b"hello world\n", "output: echo hello world → 'hello world\\n'")
 
     # Compare with GNU for various inputs
-    if os.path.exists(GNU):
+    if gnu_available():
+        prime_gnu_cache([["hello"], ["hello", "world"], [], ["-n", "hello"],
+                         ["-e", "hello\\nworld"], ["-E", "hello\\nworld"]])
         compare_with_gnu(["hello"], "output: vs GNU — hello")
         compare_with_gnu(["hello", "world"], "output: vs GNU — hello world")
         compare_with_gnu([], "output: vs GNU — no args")
@@ -593,14 +881,18 @@ def check_error_handling():
     report_result(rc == 0, "error: -z → exit 0")
 
     # Compare with GNU
-    if os.path.exists(GNU):
+    if gnu_available():
         compare_with_gnu(["--badopt"], "error: vs GNU — --badopt")
         compare_with_gnu(["-z"], "error: vs GNU — -z")
         # SKIP: --help/--version text is version-specific
         # compare_with_gnu(["--help"], "error: vs GNU — --help")
         # compare_with_gnu(["--version"], "error: vs GNU — --version")
 
-    if which("strace"):
+    run_cached("eintr", _eintr_injection)
+
+
+def _eintr_injection():
+    if have_strace():
         cmd = ["strace", "-e", "inject=write:error=EINTR:when=1", BIN, "test"]
         rc, _, _ = run(cmd)
         report_result(rc == 0 or rc == 124, "error: EINTR injection → no crash")
@@ -655,201 +947,184 @@ def check_concurrency():
 def check_tool_specific():
     log("\n=== Tool-Specific: echo ===")
 
-    # --- Basic output ---
-    rc, out, _ = run([BIN])
-    report_result(rc == 0, "echo: no args → exit 0")
-    report_result(out == b"\n", "echo: no args → just newline")
-
-    rc, out, _ = run([BIN, "hello"])
-    report_result(out == b"hello\n", "echo: single arg")
-
-    rc, out, _ = run([BIN, "hello", "world"])
-    report_result(out == b"hello world\n", "echo: multiple args joined by space")
-
-    rc, out, _ = run([BIN, "a", "b", "c", "d", "e"])
-    report_result(out == b"a b c d e\n", "echo: 5 args joined by spaces")
-
-    rc, out, _ = run([BIN, ""])
-    report_result(out == b"\n", "echo: empty arg → just newline")
-
-    rc, out, _ = run([BIN, "", ""])
-    report_result(out == b" \n", "echo: two empty args → space + newline")
-
-    # --- -n flag (no trailing newline) ---
-    rc, out, _ = run([BIN, "-n", "hello"])
-    report_result(out == b"hello", "echo: -n hello → no trailing newline")
-
-    rc, out, _ = run([BIN, "-n"])
-    report_result(out == b"", "echo: -n alone → empty output")
-
-    rc, out, _ = run([BIN, "-n", "a", "b"])
-    report_result(out == b"a b", "echo: -n a b → 'a b' no newline")
-
-    # --- -e flag (escape sequences) ---
-    rc, out, _ = run([BIN, "-e", "hello\\nworld"])
-    report_result(out == b"hello\nworld\n", "echo: -e \\n → newline")
-
-    rc, out, _ = run([BIN, "-e", "hello\\tworld"])
-    report_result(out == b"hello\tworld\n", "echo: -e \\t → tab")
-
-    rc, out, _ = run([BIN, "-e", "hello\\\\world"])
-    report_result(out == b"hello\\world\n", "echo: -e \\\\\\\\ → backslash")
-
-    rc, out, _ = run([BIN, "-e", "\\a"])
-    report_result(out == b"\a\n", "echo: -e \\a → bell (0x07)")
-
-    rc, out, _ = run([BIN, "-e", "\\b"])
-    report_result(out == b"\b\n", "echo: -e \\b → backspace (0x08)")
-
-    rc, out, _ = run([BIN, "-e", "\\f"])
-    report_result(out == b"\f\n", "echo: -e \\f → form feed (0x0c)")
-
-    rc, out, _ = run([BIN, "-e", "\\r"])
-    report_result(out == b"\r\n", "echo: -e \\r → carriage return (0x0d)")
-
-    rc, out, _ = run([BIN, "-e", "\\v"])
-    report_result(out == b"\v\n", "echo: -e \\v → vertical tab (0x0b)")
-
-    # --- Octal escapes ---
-    rc, out, _ = run([BIN, "-e", "\\0101"])
-    report_result(out == b"A\n", "echo: -e \\0101 → 'A' (octal 101 = 0x41)")
-
-    rc, out, _ = run([BIN, "-e", "\\0"])
-    # \0 with no more digits is NUL byte
-    report_result(b"\x00" in out or out == b"\n", "echo: -e \\0 → NUL or empty")
-
-    rc, out, _ = run([BIN, "-e", "\\0110\\0145\\0154\\0154\\0157"])
-    report_result(out == b"Hello\n", "echo: -e octal Hello")
-
-    # --- Hex escapes ---
-    rc, out, _ = run([BIN, "-e", "\\x41"])
-    report_result(out == b"A\n", "echo: -e \\x41 → 'A'")
-
-    rc, out, _ = run([BIN, "-e", "\\x48\\x65\\x6c\\x6c\\x6f"])
-    report_result(out == b"Hello\n", "echo: -e hex Hello")
-
-    rc, out, _ = run([BIN, "-e", "\\xff"])
-    report_result(out[0:1] == b"\xff", "echo: -e \\xff → byte 0xff")
-
-    # --- \\c (stop output) ---
-    rc, out, _ = run([BIN, "-e", "hello\\cworld"])
-    report_result(out == b"hello", "echo: -e \\c → stops output (no newline)")
-
-    # --- -E flag (disable escapes) ---
-    rc, out, _ = run([BIN, "-E", "hello\\nworld"])
-    report_result(out == b"hello\\nworld\n", "echo: -E → escapes NOT interpreted")
+    # (argv, label, check(rc, out)) — all cases run through one batched bash process
+    args_100 = [str(i) for i in range(100)]
+    cases = [
+        # --- Basic output ---
+        ([], "echo: no args → exit 0", lambda rc, out: rc == 0),
+        ([], "echo: no args → just newline", lambda rc, out: out == b"\n"),
+        (["hello"], "echo: single arg", lambda rc, out: out == b"hello\n"),
+        (["hello", "world"], "echo: multiple args joined by space",
+         lambda rc, out: out == b"hello world\n"),
+        (["a", "b", "c", "d", "e"], "echo: 5 args joined by spaces",
+         lambda rc, out: out == b"a b c d e\n"),
+        ([""], "echo: empty arg → just newline", lambda rc, out: out == b"\n"),
+        (["", ""], "echo: two empty args → space + newline", lambda rc, out: out == b" \n"),
+
+        # --- -n flag (no trailing newline) ---
+        (["-n", "hello"], "echo: -n hello → no trailing newline", lambda rc, out: out == b"hello"),
+        (["-n"], "echo: -n alone → empty output", lambda rc, out: out == b""),
+        (["-n", "a", "b"], "echo: -n a b → 'a b' no newline", lambda rc, out: out == b"a b"),
+
+        # --- -e flag (escape sequences) ---
+        (["-e", "hello\\nworld"], "echo: -e \\n → newline",
+         lambda rc, out: out == b"hello\nworld\n"),
+        (["-e", "hello\\tworld"], "echo: -e \\t → tab", lambda rc, out: out == b"hello\tworld\n"),
+        (["-e", "hello\\\\world"], "echo: -e \\\\\\\\ → backslash",
+         lambda rc, out: out == b"hello\\world\n"),
+        (["-e", "\\a"], "echo: -e \\a → bell (0x07)", lambda rc, out: out == b"\a\n"),
+        (["-e", "\\b"], "echo: -e \\b → backspace (0x08)", lambda rc, out: out == b"\b\n"),
+        (["-e", "\\f"], "echo: -e \\f → form feed (0x0c)", lambda rc, out: out == b"\f\n"),
+        (["-e", "\\r"], "echo: -e \\r → carriage return (0x0d)", lambda rc, out: out == b"\r\n"),
+        (["-e", "\\v"], "echo: -e \\v → vertical tab (0x0b)", lambda rc, out: out == b"\v\n"),
+
+        # --- Octal escapes ---
+        (["-e", "\\0101"], "echo: -e \\0101 → 'A' (octal 101 = 0x41)",
+         lambda rc, out: out == b"A\n"),
+        # \0 with no more digits is NUL byte
+        (["-e", "\\0"], "echo: -e \\0 → NUL or empty",
+         lambda rc, out: b"\x00" in out or out == b"\n"),
+        (["-e", "\\0110\\0145\\0154\\0154\\0157"], "echo: -e octal Hello",
+         lambda rc, out: out == b"Hello\n"),
+
+        # --- Hex escapes ---
+        (["-e", "\\x41"], "echo: -e \\x41 → 'A'", lambda rc, out: out == b"A\n"),
+        (["-e", "\\x48\\x65\\x6c\\x6c\\x6f"], "echo: -e hex Hello",
+         lambda rc, out: out == b"Hello\n"),
+        (["-e", "\\xff"], "echo: -e \\xff → byte 0xff", lambda rc, out: out[0:1] == b"\xff"),
+
+        # --- \\c (stop output) ---
+        (["-e", "hello\\cworld"], "echo: -e \\c → stops output (no newline)",
+         lambda rc, out: out == b"hello"),
+
+        # --- -E flag (disable escapes) ---
+        (["-E", "hello\\nworld"], "echo: -E → escapes NOT interpreted",
+         lambda rc, out: out == b"hello\\nworld\n"),
+
+        # --- Combined flags ---
+        (["-ne", "hello\\nworld"], "echo: -ne → escape + no trailing newline",
+         lambda rc, out: out == b"hello\nworld"),
+        (["-en", "hello\\n"], "echo: -en → same as -ne", lambda rc, out: out == b"hello\n"),
+        (["-nE", "hello\\n"], "echo: -nE → no newline, no escapes",
+         lambda rc, out: out == b"hello\\n"),
+
+        # --- Flag-like args that aren't flags ---
+        (["-"], "echo: - → printed", lambda rc, out: b"-" in out),
+
+        # --- Spaces and special characters ---
+        (["  hello  "], "echo: preserves internal spaces", lambda rc, out: out == b"  hello  \n"),
+        (["a  b"], "echo: preserves multiple spaces in arg", lambda rc, out: out == b"a  b\n"),
+
+        # --- Lots of args ---
+        (args_100, "echo: 100 args joined correctly",
+         lambda rc, out: out == (" ".join(args_100) + "\n").encode()),
+
+        # --- Trailing newline verification ---
+        (["test"], "echo: trailing newline present", lambda rc, out: out[-1:] == b"\n"),
+        (["-n", "test"], "echo: -n removes trailing newline",
+         lambda rc, out: out[-1:] != b"\n" or len(out) == 0),
+    ]
+    results = run_batch([args for args, _, _ in cases])
+    for (args, label, check), (rc, out) in zip(cases, results):
+        report_result(check(rc, out), label)
 
-    # --- Combined flags ---
-    rc, out, _ = run([BIN, "-ne", "hello\\nworld"])
-    report_result(out == b"hello\nworld", "echo: -ne → escape + no trailing newline")
+    # --- Stdin ignored ---
+    rc, out, _ = run([BIN, "hello"], stdin_data=b"stdin data\n")
+    report_result(out == b"hello\n", "echo: ignores stdin")
 
-    rc, out, _ = run([BIN, "-en", "hello\\n"])
-    report_result(out == b"hello\n", "echo: -en → same as -ne")
+    if not gnu_available():
+        return
 
-    rc, out, _ = run([BIN, "-nE", "hello\\n"])
-    report_result(out == b"hello\\n", "echo: -nE → no newline, no escapes")
+    test_cases = [
+        ["hello"],
+        ["hello", "world"],
+        ["-n", "hello"],
+        ["-e", "\\n"],
+        ["-e", "\\t"],
+        ["-e", "\\\\"],
+        ["-e", "\\a"],
+        ["-e", "\\b"],
+        ["-e", "\\f"],
+        ["-e", "\\r"],
+        ["-e", "\\v"],
+        ["-e", "\\0101"],
+        ["-e", "\\x41"],
+        ["-e", "\\c"],
+        ["-e", "hello\\cworld"],
+        ["-E", "\\n"],
+        ["-ne", "hello"],
+        ["-en", "hello"],
+        ["-nE", "\\n"],
+        ["-n", "-e", "hello"],
+        [""],
+        [" "],
+        ["-n"],
+        ["-e"],
+        ["-E"],
+        ["-eee"],
+        ["-nnn"],
+        ["-neE"],
+    ]
+    prime_gnu_cache([["--", "-n"], ["-abc"], ["-n", "-n", "hello"]] + test_cases)
 
     # --- -- handling ---
-    rc, out, _ = run([BIN, "--", "-n"])
     # GNU echo treats -- as just another arg to print
-    if os.path.exists(GNU):
-        compare_with_gnu(["--", "-n"], "echo: vs GNU — -- -n")
-
-    # --- Flag-like args that aren't flags ---
-    rc, out, _ = run([BIN, "-"])
-    report_result(b"-" in out, "echo: - → printed")
+    compare_with_gnu(["--", "-n"], "echo: vs GNU — -- -n")
 
-    rc, out, _ = run([BIN, "-abc"])
     # Only -n, -e, -E (and combinations) are flags; -abc is text
-    if os.path.exists(GNU):
-        compare_with_gnu(["-abc"], "echo: vs GNU — -abc")
-
-    # --- Spaces and special characters ---
-    rc, out, _ = run([BIN, "  hello  "])
-    report_result(out == b"  hello  \n", "echo: preserves internal spaces")
-
-    rc, out, _ = run([BIN, "a  b"])
-    report_result(out == b"a  b\n", "echo: preserves multiple spaces in arg")
-
-    # --- Stdin ignored ---
-    rc, out, _ = run([BIN, "hello"], stdin_data=b"stdin data\n")
-    report_result(out == b"hello\n", "echo: ignores stdin")
-
-    # --- Lots of args ---
-    args = [str(i) for i in range(100)]
-    rc, out, _ = run([BIN] + args)
-    expected = " ".join(args) + "\n"
-    report_result(out.decode() == expected, "echo: 100 args joined correctly")
+    compare_with_gnu(["-abc"], "echo: vs GNU — -abc")
 
     # --- GNU comparison batch ---
-    if os.path.exists(GNU):
-        test_cases = [
-            ["hello"],
-            ["hello", "world"],
-            ["-n", "hello"],
-            ["-e", "\\n"],
-            ["-e", "\\t"],
-            ["-e", "\\\\"],
-            ["-e", "\\a"],
-            ["-e", "\\b"],
-            ["-e", "\\f"],
-            ["-e", "\\r"],
-            ["-e", "\\v"],
-            ["-e", "\\0101"],
-            ["-e", "\\x41"],
-            ["-e", "\\c"],
-            ["-e", "hello\\cworld"],
-            ["-E", "\\n"],
-            ["-ne", "hello"],
-            ["-en", "hello"],
-            ["-nE", "\\n"],
-            ["-n", "-e", "hello"],
-            [""],
-            [" "],
-            ["-n"],
-            ["-e"],
-            ["-E"],
-            ["-eee"],
-            ["-nnn"],
-            ["-neE"],
-        ]
-        for args in test_cases:
-            compare_with_gnu(args)
+    compare_many_with_gnu(test_cases)
 
     # --- Multiple -n flags ---
-    rc, out, _ = run([BIN, "-n", "-n", "hello"])
     # Second -n is treated as text by some implementations, or as repeated flag
-    if os.path.exists(GNU):
-        compare_with_gnu(["-n", "-n", "hello"], "echo: vs GNU — -n -n hello")
-
-    # --- Trailing newline verification ---
-    rc, out, _ = run([BIN, "test"])
-    report_result(out[-1:] == b"\n", "echo: trailing newline present")
-
-    rc, out, _ = run([BIN, "-n", "test"])
-    report_result(out[-1:] != b"\n" or len(out) == 0, "echo: -n removes trailing newline")
+    compare_with_gnu(["-n", "-n", "hello"], "echo: vs GNU — -n -n hello")
 
 
 # =============================================================================
 #                           MAIN
 # =============================================================================
 
+def run_section(fn):
+    """Run one check_* with its log lines buffered; returns the lines."""
+    _local.lines = []
+    try:
+        fn()
+        return _local.lines
+    except BaseException:
+        print("\n".join(_local.lines), flush=True)
+        raise
+    finally:
+        _local.lines = None
+
+
 def run_tests():
     find_binary()
-    check_elf_properties()
-    check_strings_leaks()
-    check_syscall_surface()
-    check_proc_analysis()
+    # Independent sections overlap their subprocess waits on a thread pool and
+    # are printed in order. Sections using preexec_fn (unsafe with threads) and
+    # the concurrency stress run serially afterwards.
+    parallel = [
+        check_elf_properties,
+        check_strings_leaks,
+        check_syscall_surface,
+        check_proc_analysis,
+        check_signal_safety,
+        check_fuzzing,
+        check_environment,
+        check_output_integrity,
+        check_error_handling,
+        check_tool_specific,
+    ]
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        futures = [pool.submit(run_section, fn) for fn in parallel]
+        for future in futures:
+            log("\n".join(future.result()))
     check_fd_hygiene()
     check_memory_safety()
-    check_signal_safety()
-    check_fuzzing()
     check_resource_limits()
-    check_environment()
-    check_output_integrity()
-    check_error_handling()
     check_concurrency()
-    check_tool_specific()
+    close_persistent()
 
 
 def print_summary():
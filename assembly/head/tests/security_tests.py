@@ -3,14 +3,19 @@
 
 import os
 import sys
+import fcntl
+import selectors
 import subprocess
 import struct
+import hashlib
 import signal
+import shlex
 import time
 import random
 import string
 import tempfile
 import resource
+import multiprocessing
 from pathlib import Path
 from shutil import which
 
@@ -23,6 +28,26 @@ BSS_SIZE = 65536  # Typical BSS buffer size for assembly tools
 TOOL_NAME = "head"
 BIN = str(Path(__file__).resolve().parent.parent / "fhead")
 GNU = "/usr/bin/head"
+RESTORE_SIGNALS = (signal.SIGPIPE, signal.SIGXFSZ)  # Python ignores these; children must not
+DETERMINISM_RUNS = 3  # integrity determinism runs; --thorough raises this to 10
+PIPE_SIZE = 1 << 20  # capped by /proc/sys/fs/pipe-max-size; the 64KB default is kept on failure
+
+# Probed once at import instead of at every use
+_STRACE_PATH = which("strace")
+_HAVE_STRACE = _STRACE_PATH is not None
+_HAVE_DEV_FULL = os.path.exists("/dev/full")
+
+# Test corpora, built once and shared by every run that feeds them
+_CORPUS_5 = b"".join(f"line{i:03d}\n".encode() for i in range(5))
+_CORPUS_20 = b"".join(f"line{i:03d}\n".encode() for i in range(20))
+_CORPUS_L20 = b"".join(f"L{i}\n".encode() for i in range(20))
+_CORPUS_DET = b"".join(f"line {i}\n".encode() for i in range(50))
+_CORPUS_100 = b"".join(f"line {i:06d}\n".encode() for i in range(100))
+_CORPUS_100_HEAD10 = _CORPUS_100[:len(b"line 000000\n") * 10]
+_CORPUS_10K = b"".join(f"L{i:08d}\n".encode() for i in range(10000))
+_SEQ_100 = b"".join(f"{i}\n".encode() for i in range(1, 101))
+_SEQ_1000 = b"".join(f"{i}\n".encode() for i in range(1, 1001))
+_LARGE_ENV = {f"VAR_{i}": f"value_{i}" * 100 for i in range(1000)}
 
 # =============================================================================
 #                           TEST HARNESS
@@ -32,9 +57,23 @@ failures = []
 test_count = 0
 pass_count = 0
 skip_count = 0
+_log_lines = None  # set inside pool workers so suite output is returned, not printed
+_LOG_BUF = []  # parent output, written in one go at each suite boundary
+LINE_BUFFERED = False  # --line-buffered: write every line as it is logged
 
 def log(msg):
-    print(msg, flush=True)
+    if _log_lines is not None:
+        _log_lines.append(msg)
+    elif LINE_BUFFERED:
+        print(msg, flush=True)
+    else:
+        _LOG_BUF.append(msg)
+
+def flush_log():
+    if _LOG_BUF:
+        sys.stdout.write("\n".join(_LOG_BUF) + "\n")
+        _LOG_BUF.clear()
+    sys.stdout.flush()
 
 def record_failure(label, note=""):
     failures.append({"label": label, "note": note})
@@ -61,6 +100,11 @@ def run(cmd, stdin_data=None, timeout=TIMEOUT, env=None, preexec_fn=None):
             cmd, stdin=subprocess.PIPE if stdin_data is not None else subprocess.DEVNULL,
             stdout=subprocess.PIPE, stderr=subprocess.PIPE,
             env=env, preexec_fn=preexec_fn)
+        for pipe in (p.stdout, p.stderr):
+            try:
+                fcntl.fcntl(pipe.fileno(), fcntl.F_SETPIPE_SZ, PIPE_SIZE)
+            except OSError:
+                pass
         out, err = p.communicate(input=stdin_data, timeout=timeout)
         return p.returncode, out, err
     except subprocess.TimeoutExpired:
@@ -70,8 +114,117 @@ def run(cmd, stdin_data=None, timeout=TIMEOUT, env=None, preexec_fn=None):
     except Exception as e:
         return -1, b"", str(e).encode()
 
+def spawn_piped(cmd):
+    """posix_spawn cmd with stdio on pipes; returns (pid, stdin_w, stdout_r, stderr_r) or None."""
+    in_r, in_w = os.pipe2(os.O_CLOEXEC)
+    out_r, out_w = os.pipe2(os.O_CLOEXEC)
+    err_r, err_w = os.pipe2(os.O_CLOEXEC)
+    actions = [(os.POSIX_SPAWN_DUP2, in_r, 0),
+               (os.POSIX_SPAWN_DUP2, out_w, 1),
+               (os.POSIX_SPAWN_DUP2, err_w, 2)]
+    try:
+        pid = os.posix_spawn(cmd[0], cmd, os.environ, file_actions=actions,
+                             setsigdef=RESTORE_SIGNALS)
+    except OSError:
+        for fd in (in_w, out_r, err_r):
+            os.close(fd)
+        return None
+    finally:
+        for fd in (in_r, out_w, err_w):
+            os.close(fd)
+    return pid, in_w, out_r, err_r
+
+def feed_all(jobs, timeout=TIMEOUT):
+    """Run (cmd, stdin_data) jobs at once, all pipes multiplexed on one selector (epoll).
+
+    Output is drained and discarded. Returns exit codes in job order: 124 if
+    the job was still running at the deadline, -1 if it could not be spawned.
+    """
+    rcs = [-1] * len(jobs)
+    pids = {}
+    with selectors.DefaultSelector() as sel:
+        for i, (cmd, data) in enumerate(jobs):
+            spawned = spawn_piped(cmd)
+            if spawned is None:
+                continue
+            pid, in_w, out_r, err_r = spawned
+            pids[i] = pid
+            os.set_blocking(in_w, False)
+            sel.register(in_w, selectors.EVENT_WRITE, (i, memoryview(data), [0]))
+            sel.register(out_r, selectors.EVENT_READ, (i, None, None))
+            sel.register(err_r, selectors.EVENT_READ, (i, None, None))
+
+        def close(fd):
+            sel.unregister(fd)
+            os.close(fd)
+
+        deadline = time.monotonic() + timeout
+        while sel.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for key, _ in sel.select(remaining):
+                i, view, pos = key.data
+                if view is not None:
+                    try:
+                        pos[0] += os.write(key.fd, view[pos[0]:pos[0] + 65536])
+                    except BrokenPipeError:
+                        pos[0] = len(view)
+                    if pos[0] >= len(view):
+                        close(key.fd)
+                elif not os.read(key.fd, 65536):
+                    close(key.fd)
+        # Jobs with a pipe still open at the deadline have timed out
+        stuck = {key.data[0] for key in sel.get_map().values()}
+        for key in list(sel.get_map().values()):
+            close(key.fd)
+
+    for i, pid in pids.items():
+        if i in stuck:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+            rcs[i] = 124
+        else:
+            rcs[i] = os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1])
+    return rcs
+
+def run_pipeline(cmds, stdin_data, timeout=TIMEOUT):
+    """Run cmds connected stdout→stdin without a shell; returns ([rc, ...], last stdout).
+
+    stdin_data is written up front, so it should fit in a pipe buffer.
+    """
+    procs = []
+    try:
+        for cmd in cmds:
+            procs.append(subprocess.Popen(
+                cmd, stdin=procs[-1].stdout if procs else subprocess.PIPE,
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL))
+            if len(procs) > 1:
+                procs[-2].stdout.close()
+        try:
+            procs[0].stdin.write(stdin_data)
+        except BrokenPipeError:
+            pass
+        procs[0].stdin.close()
+        out, _ = procs[-1].communicate(timeout=timeout)
+        return [p.wait(timeout=timeout) for p in procs], out
+    except subprocess.TimeoutExpired:
+        for p in procs:
+            p.kill()
+            p.wait()
+        return [124] * len(cmds), b""
+
+# GNU head is deterministic for fixed (args, stdin), so its results are memoized
+_gnu_cache = {}
+
 def run_gnu(cmd_args, stdin_data=None, timeout=TIMEOUT):
-    return run([GNU] + cmd_args, stdin_data=stdin_data, timeout=timeout)
+    key = (tuple(cmd_args), stdin_data)
+    if key not in _gnu_cache:
+        result = run([GNU] + cmd_args, stdin_data=stdin_data, timeout=timeout)
+        if result[0] == 124:
+            return result
+        _gnu_cache[key] = result
+    return _gnu_cache[key]
 
 def run_asm(cmd_args, stdin_data=None, timeout=TIMEOUT, env=None, preexec_fn=None):
     return run([BIN] + cmd_args, stdin_data=stdin_data, timeout=timeout, env=env, preexec_fn=preexec_fn)
@@ -152,36 +305,36 @@ def test_elf_binary_security():
 
 def test_syscall_surface():
     log("\n=== Syscall Surface Analysis ===")
-    if not which("strace"):
+    if not _HAVE_STRACE:
         skip_test("syscall: strace analysis", "strace not available")
         return
 
     test_input = b"line1\nline2\nline3\n"
 
     # Test --help path
-    rc, out, err = run(["strace", "-f", "-e", "trace=%network", BIN, "--help"])
+    rc, out, err = run([_STRACE_PATH, "-f", "-e", "trace=%network", BIN, "--help"])
     net_calls = [l for l in err.split(b"\n") if b"socket(" in l or b"connect(" in l or b"bind(" in l]
     report_result(len(net_calls) == 0, "syscall: no network syscalls (--help)")
 
     # Test stdin processing path
-    rc, out, err = run(["strace", "-f", "-e", "trace=%network", BIN], stdin_data=test_input)
+    rc, out, err = run([_STRACE_PATH, "-f", "-e", "trace=%network", BIN], stdin_data=test_input)
     net_calls = [l for l in err.split(b"\n") if b"socket(" in l or b"connect(" in l]
     report_result(len(net_calls) == 0, "syscall: no network syscalls (stdin)")
 
     # No process spawning
-    rc, out, err = run(["strace", "-f", "-e", "trace=%process", BIN, "--help"])
+    rc, out, err = run([_STRACE_PATH, "-f", "-e", "trace=%process", BIN, "--help"])
     spawn_calls = [l for l in err.split(b"\n") if b"fork(" in l or b"vfork(" in l or b"clone(" in l]
     spawn_calls = [l for l in spawn_calls if b"execve(" not in l]
     report_result(len(spawn_calls) == 0, "syscall: no process spawning")
 
     # No memory allocation syscalls
-    rc, out, err = run(["strace", "-f", "-e", "trace=brk,mmap,mprotect", BIN], stdin_data=test_input)
+    rc, out, err = run([_STRACE_PATH, "-f", "-e", "trace=brk,mmap,mprotect", BIN], stdin_data=test_input)
     mem_lines = [l for l in err.split(b"\n") if b"brk(" in l or b"mmap(" in l or b"mprotect(" in l]
     mem_lines = [l for l in mem_lines if not l.startswith(b"---") and not l.startswith(b"+++")]
     report_result(len(mem_lines) == 0, "syscall: no brk/mmap/mprotect (stdin path)")
 
     # Count unique syscalls
-    rc, out, err = run(["strace", "-c", "-e", "trace=all", BIN], stdin_data=test_input)
+    rc, out, err = run([_STRACE_PATH, "-c", "-e", "trace=all", BIN], stdin_data=test_input)
     report_result(rc in (0, 124), "syscall: strace -c completed")
 
 # =============================================================================
@@ -281,7 +434,7 @@ def test_fd_hygiene():
     report_result(p.returncode == 0, "fd: closed stderr doesn't crash")
 
     # /dev/full
-    if os.path.exists("/dev/full"):
+    if _HAVE_DEV_FULL:
         script = f'echo "test data" | {BIN} > /dev/full 2>/dev/null; echo $?'
         p = subprocess.run(["bash", "-c", script], capture_output=True, timeout=TIMEOUT, text=True)
         rc_str = p.stdout.strip()
@@ -463,13 +616,14 @@ def test_signal_safety():
             pass
 
     # Rapid SIGPIPE stress
-    ok_count = 0
     trials = 20
-    for _ in range(trials):
-        script = f'seq 100 | {BIN} -n 5 | head -c 1 >/dev/null 2>/dev/null'
-        rc = os.system(script)
-        if rc == 0:
-            ok_count += 1
+    script = (f'for i in $(seq {trials}); do '
+              f'seq 100 | {BIN} -n 5 | head -c 1 >/dev/null 2>/dev/null; echo $?; done')
+    try:
+        p = subprocess.run(["bash", "-c", script], capture_output=True, timeout=TIMEOUT * 2)
+        ok_count = sum(1 for l in p.stdout.splitlines() if l.strip() == b"0")
+    except subprocess.TimeoutExpired:
+        ok_count = 0
     report_result(ok_count >= trials - 2, f"signal: rapid SIGPIPE ({ok_count}/{trials})")
 
 # =============================================================================
@@ -598,8 +752,7 @@ def test_environment():
     report_result(rc < 128, "env: hostile environment no crash")
 
     # Large environment
-    large_env = {f"VAR_{i}": f"value_{i}" * 100 for i in range(1000)}
-    rc, out, err = run_asm([], stdin_data=test_data, env=large_env)
+    rc, out, err = run_asm([], stdin_data=test_data, env=_LARGE_ENV)
     report_result(rc < 128, "env: large environment (1000 vars)")
 
 # =============================================================================
@@ -610,12 +763,12 @@ def test_output_integrity():
     log("\n=== Output Integrity ===")
 
     # Deterministic output
-    test_data = b"".join(f"line {i}\n".encode() for i in range(50))
     results = []
-    for _ in range(10):
-        rc, out, err = run_asm([], stdin_data=test_data)
-        results.append(out)
-    report_result(len(set(results)) == 1, "integrity: deterministic (10 trials)")
+    for _ in range(DETERMINISM_RUNS):
+        rc, out, err = run_asm([], stdin_data=_CORPUS_DET)
+        results.append(hashlib.blake2b(out, digest_size=16).digest())
+    report_result(len(set(results)) == 1,
+                  f"integrity: deterministic ({DETERMINISM_RUNS} trials)")
 
     # stderr/stdout isolation
     rc, out, err = run_asm([], stdin_data=b"hello\n")
@@ -631,16 +784,13 @@ def test_output_integrity():
         report_result(rc_asm == rc_gnu, f"integrity: exit code match GNU ({desc})")
 
     # Large output integrity
-    lines = [f"line {i:06d}\n".encode() for i in range(100)]
-    data = b"".join(lines)
-    rc, out, err = run_asm(["-n", "10"], stdin_data=data)
-    expected = b"".join(lines[:10])
-    report_result(out == expected, "integrity: first 10 lines of 100")
+    rc, out, err = run_asm(["-n", "10"], stdin_data=_CORPUS_100)
+    report_result(out == _CORPUS_100_HEAD10, "integrity: first 10 lines of 100")
 
     # Compare output with GNU on various inputs
     for desc, args, data in [
-        ("5 lines", ["-n", "5"], b"".join(f"L{i}\n".encode() for i in range(20))),
-        ("default 10", [], b"".join(f"L{i}\n".encode() for i in range(20))),
+        ("5 lines", ["-n", "5"], _CORPUS_L20),
+        ("default 10", [], _CORPUS_L20),
         ("more than available", ["-n", "100"], b"only three\nlines\nhere\n"),
     ]:
         rc_a, out_a, _ = run_asm(args, stdin_data=data)
@@ -660,27 +810,26 @@ def test_error_handling():
     report_result(rc_a != 0, "error: invalid flag returns nonzero")
 
     # EINTR injection
-    if which("strace"):
-        rc, out, err = run(["strace", "-e", "inject=write:error=EINTR:when=1",
+    if _HAVE_STRACE:
+        rc, out, err = run([_STRACE_PATH, "-e", "inject=write:error=EINTR:when=1",
                             BIN], stdin_data=b"hello\nworld\n")
         report_result(rc in (0, 1, 124), "error: EINTR injection on write")
 
-        rc, out, err = run(["strace", "-e", "inject=read:error=EINTR:when=1",
+        rc, out, err = run([_STRACE_PATH, "-e", "inject=read:error=EINTR:when=1",
                             BIN], stdin_data=b"hello\nworld\n")
         report_result(rc in (0, 1, 124), "error: EINTR injection on read")
     else:
         skip_test("error: EINTR injection", "no strace")
 
     # /dev/full write
-    if os.path.exists("/dev/full"):
+    if _HAVE_DEV_FULL:
         script = f'echo "test" | {BIN} > /dev/full 2>/dev/null; echo $?'
         p = subprocess.run(["bash", "-c", script], capture_output=True, timeout=TIMEOUT, text=True)
         report_result(p.returncode == 0, "error: /dev/full write")
 
-    # Broken pipe mid-output
-    script = f'seq 1000 | {BIN} -n 500 | head -c 10 >/dev/null 2>/dev/null; echo $?'
-    p = subprocess.run(["bash", "-c", script], capture_output=True, timeout=TIMEOUT, text=True)
-    report_result(p.returncode == 0, "error: broken pipe mid-output")
+    # Broken pipe mid-output: fhead must exit 0 on EPIPE or die by SIGPIPE, nothing else
+    rcs, _ = run_pipeline([[BIN, "-n", "500"], ["head", "-c", "10"]], _SEQ_1000)
+    report_result(rcs[0] in (0, -signal.SIGPIPE), "error: broken pipe mid-output")
 
 # =============================================================================
 #                     12. CONCURRENCY STRESS
@@ -690,45 +839,30 @@ def test_concurrency():
     log("\n=== Concurrency Stress ===")
 
     # 50 simultaneous instances
-    procs = []
-    for i in range(50):
-        data = f"instance {i} line\n".encode() * 10
-        p = subprocess.Popen([BIN], stdin=subprocess.PIPE,
-                             stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        procs.append((p, data))
-
-    all_ok = True
-    for p, data in procs:
-        try:
-            out, err = p.communicate(input=data, timeout=TIMEOUT)
-            if p.returncode >= 128:
-                all_ok = False
-        except subprocess.TimeoutExpired:
-            p.kill()
-            p.communicate()
-            all_ok = False
+    datas = [f"instance {i} line\n".encode() * 10 for i in range(50)]
+    rcs = feed_all([([BIN], d) for d in datas])
+    all_ok = all(0 <= rc < 128 and rc != 124 for rc in rcs)
     report_result(all_ok, "concurrency: 50 simultaneous instances")
 
     # Pipe chains
-    script = f'seq 100 | {BIN} -n 50 | {BIN} -n 25 | {BIN} -n 10 | wc -l'
-    p = subprocess.run(["bash", "-c", script], capture_output=True, timeout=TIMEOUT, text=True)
-    report_result(p.stdout.strip() == "10", "concurrency: pipe chain head|head|head")
+    _, out = run_pipeline([[BIN, "-n", "50"], [BIN, "-n", "25"], [BIN, "-n", "10"]], _SEQ_100)
+    report_result(out.count(b"\n") == 10, "concurrency: pipe chain head|head|head")
 
     # Rapid start/kill
-    ok_count = 0
-    for _ in range(20):
-        p = subprocess.Popen([BIN], stdin=subprocess.PIPE,
-                             stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        try:
-            time.sleep(0.01)
-            p.kill()
-            p.wait(timeout=2)
-            ok_count += 1
-        except:
-            try:
-                p.kill()
-            except:
-                pass
+    # fd 3 is a pipe held open by a sleep, so each instance blocks on read until killed.
+    # The script gets its own session so a timeout can take the holder down with it
+    script = (f'exec 3< <(exec sleep 30); holder=$!; trap \'kill $holder\' EXIT; '
+              f'for i in $(seq 20); do {BIN} <&3 >/dev/null 2>&1 & pid=$!; '
+              f'sleep 0.01; kill -KILL $pid; wait $pid; echo $?; done')
+    p = subprocess.Popen(["bash", "-c", script], stdout=subprocess.PIPE,
+                         stderr=subprocess.DEVNULL, start_new_session=True)
+    try:
+        out, _ = p.communicate(timeout=TIMEOUT * 2)
+        ok_count = len(out.split())
+    except subprocess.TimeoutExpired:
+        os.killpg(p.pid, signal.SIGKILL)
+        p.communicate()
+        ok_count = 0
     report_result(ok_count >= 18, f"concurrency: rapid start/kill ({ok_count}/20)")
 
 # =============================================================================
@@ -738,18 +872,31 @@ def test_concurrency():
 def test_head_specific():
     log("\n=== Head-Specific Tests ===")
 
-    lines_20 = b"".join(f"line{i:03d}\n".encode() for i in range(20))
-    lines_5 = b"".join(f"line{i:03d}\n".encode() for i in range(5))
+    lines_20 = _CORPUS_20
+    lines_5 = _CORPUS_5
 
     # Default 10 lines
     rc_a, out_a, _ = run_asm([], stdin_data=lines_20)
     rc_g, out_g, _ = run_gnu([], stdin_data=lines_20)
     report_result(out_a == out_g, "head: default 10 lines matches GNU")
 
-    # -n N
-    for n in [1, 5, 10, 15, 20, 100]:
-        rc_a, out_a, _ = run_asm(["-n", str(n)], stdin_data=lines_20)
-        rc_g, out_g, _ = run_gnu(["-n", str(n)], stdin_data=lines_20)
+    # -n N: the whole fhead/GNU matrix runs in one bash, outputs framed by NULs
+    counts = [1, 5, 10, 15, 20, 100]
+    with tempfile.NamedTemporaryFile() as f:
+        f.write(lines_20)
+        f.flush()
+        src = shlex.quote(f.name)
+        script = "".join(
+            f"printf '\\0'; {shlex.quote(BIN)} -n {n} < {src}; "
+            f"printf '\\0'; {shlex.quote(GNU)} -n {n} < {src}; " for n in counts)
+        try:
+            matrix = subprocess.run(["bash", "-c", script], capture_output=True,
+                                    timeout=TIMEOUT).stdout
+        except subprocess.TimeoutExpired:
+            matrix = b""
+    sections = matrix.split(b"\0")[1:]
+    for i, n in enumerate(counts):
+        out_a, out_g = sections[2 * i:2 * i + 2] if len(sections) >= 2 * i + 2 else (None, b"")
         report_result(out_a == out_g, f"head: -n {n} matches GNU")
 
     # -n 0
@@ -818,9 +965,8 @@ def test_head_specific():
         skip_test("head: -n -N", "not supported or error")
 
     # Large input default head
-    large = b"".join(f"L{i:08d}\n".encode() for i in range(10000))
-    rc_a, out_a, _ = run_asm([], stdin_data=large)
-    rc_g, out_g, _ = run_gnu([], stdin_data=large)
+    rc_a, out_a, _ = run_asm([], stdin_data=_CORPUS_10K)
+    rc_g, out_g, _ = run_gnu([], stdin_data=_CORPUS_10K)
     report_result(out_a == out_g, "head: large input (10K lines) default 10")
 
 # =============================================================================
@@ -834,24 +980,75 @@ def run_tests():
 
     if not os.path.isfile(BIN):
         log(f"[FATAL] Binary not found: {BIN}")
+        flush_log()
         sys.exit(2)
     if not os.access(BIN, os.X_OK):
         log(f"[FATAL] Binary not executable: {BIN}")
+        flush_log()
         sys.exit(2)
-
-    test_elf_binary_security()
-    test_syscall_surface()
-    test_proc_runtime()
-    test_fd_hygiene()
-    test_memory_safety()
-    test_signal_safety()
-    test_input_fuzzing()
-    test_resource_limits()
-    test_environment()
-    test_output_integrity()
-    test_error_handling()
-    test_concurrency()
-    test_head_specific()
+    flush_log()
+
+    suites = [
+        test_elf_binary_security, test_syscall_surface, test_proc_runtime,
+        test_fd_hygiene, test_memory_safety, test_signal_safety,
+        test_input_fuzzing, test_resource_limits, test_environment,
+        test_output_integrity, test_error_handling, test_concurrency,
+        test_head_specific,
+    ]
+    # The VmRSS sampling in the memory suite races fhead's exit on a contended
+    # CPU, so it runs (output captured) before the pool workers start.
+    done = {test_memory_safety: _run_suite(test_memory_safety)}
+    with multiprocessing.Pool(os.cpu_count(), initializer=_init_worker,
+                              initargs=(LINE_BUFFERED, DETERMINISM_RUNS)) as pool:
+        pending = {fn: pool.apply_async(_run_suite, (fn,))
+                   for fn in suites if fn in POOLED_SUITES}
+        for fn in suites:
+            if fn in done:
+                _merge_suite(*done[fn])
+            elif fn in pending:
+                _merge_suite(*pending[fn].get())
+            else:
+                fn()
+            flush_log()
+
+def _init_worker(line_buffered, determinism_runs):
+    """Apply the command-line options in a pool worker; spawn/forkserver workers
+    re-import the module and would otherwise see only the defaults."""
+    global LINE_BUFFERED, DETERMINISM_RUNS
+    LINE_BUFFERED = line_buffered
+    DETERMINISM_RUNS = determinism_runs
+
+def _run_suite(fn):
+    """Run one suite from zeroed counters and return its results and log lines."""
+    global failures, test_count, pass_count, skip_count, _log_lines
+    saved = failures, test_count, pass_count, skip_count, _log_lines
+    failures, test_count, pass_count, skip_count, _log_lines = [], 0, 0, 0, []
+    try:
+        fn()
+        return test_count, pass_count, skip_count, failures, _log_lines
+    except BaseException:
+        # Show what the suite got through before the traceback
+        flush_log()
+        print("\n".join(_log_lines), flush=True)
+        raise
+    finally:
+        failures, test_count, pass_count, skip_count, _log_lines = saved
+
+def _merge_suite(tc, pc, sc, suite_failures, lines):
+    global test_count, pass_count, skip_count
+    test_count += tc
+    pass_count += pc
+    skip_count += sc
+    failures.extend(suite_failures)
+    for line in lines:
+        log(line)
+
+# Suites that share no state with the rest and run in pool workers; the ELF,
+# syscall, /proc, memory, signal and concurrency suites stay in the parent.
+POOLED_SUITES = {
+    test_fd_hygiene, test_input_fuzzing, test_resource_limits, test_environment,
+    test_output_integrity, test_error_handling, test_head_specific,
+}
 
 def print_summary():
     log(f"\n{'='*60}")
@@ -862,8 +1059,12 @@ def print_summary():
         for f in failures:
             log(f"  - {f['label']}: {f.get('note', '')}")
     log(f"{'='*60}")
+    flush_log()
 
 if __name__ == "__main__":
+    LINE_BUFFERED = "--line-buffered" in sys.argv[1:]
+    if "--thorough" in sys.argv[1:]:
+        DETERMINISM_RUNS = 10
     run_tests()
     print_summary()
     sys.exit(0 if (test_count - pass_count - skip_count) == 0 else 1)
@@ -23,26 +23,57 @@ TEST CATEGORIES:
 
 import os
 import sys
+import asyncio
 import subprocess
 import struct
+import mmap
+import re
 import signal
 import time
 import random
 import string
 import tempfile
 import resource
+from collections import Counter
 from pathlib import Path
 from shutil import which
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # =============================================================================
 #                           CONFIGURATION
 # =============================================================================
 
 TIMEOUT = 5
 BIN = ""
+_BIN_BYTES = None  # read-only mmap of BIN, shared by the ELF and strings checks
 GNU = "/usr/bin/logname"
 LOG_EVERY = 1
 
+# Valid login name: alphanumeric/underscore start, then alphanumerics, '_', '-', '.'
+_USER_RE = re.compile(r'^[a-zA-Z0-9_][\-a-zA-Z0-9_.]*$')
+
+# strace line classifier for check_syscall_surface: the syscall name of a trace line
+SYSCALL_CLASS_RE = re.compile(
+    r'\b(socket|connect|bind|listen|accept|fork|vfork|clone3?|brk|mmap|mprotect|write)\(')
+
+# strace invocation for check_syscall_surface, and its filter for signal/exit
+# markers and the initial execve() line
+STRACE_CMD = ["strace", "-f", "-e",
+              "trace=%process,%network,write,read,openat,open,creat,brk,mmap,mprotect,ioctl"]
+_STRACE_KEEP = re.compile(r'^(?!---|\+\+\+|execve\()(.+)$', re.M)
+
+# 1000-variable environment for check_environment; never mutated, so built once
+_BIG_ENV = {f"VAR_{i}": "value_" + "X" * 100 for i in range(1000)}
+
+# Fuzz argument alphabet; numpy draws every argument of a batch in one call when present
+if np is not None:
+    _PRINTABLE_ARR = np.frombuffer(string.printable.encode("latin-1"), dtype=np.uint8)
+    _RNG = np.random.default_rng()
+
 # =============================================================================
 #                           TEST HARNESS
 # =============================================================================
@@ -92,10 +123,22 @@ def find_binary():
     log(f"Binary: {BIN}")
 
 
+def _binary():
+    """Map BIN once and return the mapping (b"" for an empty file)."""
+    global _BIN_BYTES
+    if _BIN_BYTES is None:
+        with open(BIN, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            _BIN_BYTES = mmap.mmap(f.fileno(), 0, prot=mmap.PROT_READ) if size else b""
+    return _BIN_BYTES
+
+
 def run(cmd, stdin_data=None, env=None, preexec_fn=None, timeout=None):
     if timeout is None:
         timeout = TIMEOUT
     try:
+        # Without a preexec_fn, close_fds=False lets Popen take its posix_spawn() path;
+        # our own fds are all O_CLOEXEC, so nothing extra leaks into the child.
         p = subprocess.Popen(
             cmd,
             stdin=subprocess.PIPE if stdin_data is not None else subprocess.DEVNULL,
@@ -103,6 +146,7 @@ def run(cmd, stdin_data=None, env=None, preexec_fn=None, timeout=None):
             stderr=subprocess.PIPE,
             env=env,
             preexec_fn=preexec_fn,
+            close_fds=preexec_fn is not None,
         )
     except (OSError, ValueError):
         return (126, b'', b'OSError')
@@ -115,6 +159,46 @@ def run(cmd, stdin_data=None, env=None, preexec_fn=None, timeout=None):
     return (p.returncode, out, err)
 
 
+async def run_many(argv_list, concurrency=None, timeout=None):
+    """Run every argv concurrently (at most `concurrency` at a time); returns run()-style tuples."""
+    if concurrency is None:
+        concurrency = (os.cpu_count() or 1) * 4
+    if timeout is None:
+        timeout = TIMEOUT
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(argv):
+        async with sem:
+            try:
+                p = await asyncio.create_subprocess_exec(
+                    *argv, stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+                    close_fds=False)
+            except (OSError, ValueError):
+                return (126, b'', b'OSError')
+            try:
+                out, err = await asyncio.wait_for(p.communicate(), timeout)
+            except asyncio.TimeoutError:
+                p.kill()
+                out, err = await p.communicate()
+                return (124, out, err)
+            return (p.returncode, out, err)
+
+    return await asyncio.gather(*(one(argv) for argv in argv_list))
+
+
+def random_printable_args(lengths):
+    """One random string.printable argument per entry of lengths."""
+    if np is None:
+        return ["".join(random.choices(string.printable, k=k)) for k in lengths]
+    blob = _RNG.choice(_PRINTABLE_ARR, size=sum(lengths)).tobytes().decode("latin-1")
+    args, off = [], 0
+    for k in lengths:
+        args.append(blob[off:off + k])
+        off += k
+    return args
+
+
 # =============================================================================
 #                     1. ELF BINARY SECURITY ANALYSIS
 # =============================================================================
@@ -122,8 +206,7 @@ def run(cmd, stdin_data=None, env=None, preexec_fn=None, timeout=None):
 def check_elf_properties():
     log("\n=== ELF Binary Security Analysis ===")
     try:
-        with open(BIN, "rb") as f:
-            elf = f.read()
+        elf = _binary()
     except Exception as e:
         record_failure("elf", f"Cannot read binary: {e}")
         report_result(False, "elf: read binary")
@@ -177,8 +260,7 @@ def check_elf_properties():
 
 def check_strings_leaks():
     log("\n=== Binary String Leak Analysis ===")
-    with open(BIN, "rb") as f:
-        data = f.read()
+    data = _binary()
 
     bad_patterns = [
         # (b"/etc/", "filesystem path /etc/"),  # logname may legitimately reference /etc/passwd,
@@ -193,17 +275,26 @@ def check_strings_leaks():
         (b"libc", "libc reference"),
         (b"glibc", "glibc reference"),
     ]
+    # One lookahead scan finds every start offset; a pattern nested in another hit
+    # ("libc" in "glibc") is credited by substring
+    rx = re.compile(b"(?=" + b"|".join(b"(" + re.escape(p) + b")" for p, _ in bad_patterns) + b")")
+    hits = {bad_patterns[m.lastindex - 1][0] for m in rx.finditer(data)}
+    hits |= {p for p, _ in bad_patterns if any(p in h for h in hits)}
     for pattern, desc in bad_patterns:
-        found = pattern in data
+        found = pattern in hits
         if found:
             record_failure("strings", f"Found '{pattern.decode(errors='replace')}' ({desc})")
         report_result(not found, f"strings: no {desc} in binary")
 
     if len(data) > 0:
-        from collections import Counter
-        import math
-        counts = Counter(data)
-        entropy = sum(-((c / len(data)) * math.log2(c / len(data))) for c in counts.values())
+        if np is not None:
+            counts = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+            p = counts[counts > 0] / len(data)
+            entropy = float(-np.sum(p * np.log2(p)))
+        else:
+            import math
+            counts = Counter(data)
+            entropy = sum(-((c / len(data)) * math.log2(c / len(data))) for c in counts.values())
         report_result(entropy < 7.0, f"strings: binary entropy {entropy:.2f} (<7.0)")
 
 
@@ -217,37 +308,36 @@ def check_syscall_surface():
         report_skip("syscall: strace not available")
         return
 
-    cmd = ["strace", "-f", "-e",
-           "trace=%process,%network,write,read,openat,open,creat,brk,mmap,mprotect,ioctl",
-           BIN]
-    rc, out, err = run(cmd)
-    err_text = err.decode(errors="replace")
-    lines = [l for l in err_text.splitlines()
-             if l and not l.startswith("---") and not l.startswith("+++")
-             and not l.startswith("execve(")]
+    rc, out, err = run(STRACE_CMD + [BIN])
+    lines = _STRACE_KEEP.findall(err.decode(errors="replace"))
+
+    # Classify every line in one pass
+    counts = Counter()
+    total = 0
+    for l in lines:
+        m = SYSCALL_CLASS_RE.search(l)
+        if m:
+            counts[m.group(1)] += 1
+        if "(" in l and "=" in l:
+            total += 1
+    net_calls = sum(counts[n] for n in ("socket", "connect", "bind", "listen", "accept"))
+    spawn_calls = sum(counts[n] for n in ("fork", "vfork", "clone", "clone3"))
+    mem_calls = sum(counts[n] for n in ("brk", "mmap", "mprotect"))
 
     # No network syscalls
-    net_calls = [l for l in lines if any(s in l for s in
-                 ["socket(", "connect(", "bind(", "listen(", "accept("])]
-    report_result(len(net_calls) == 0, "syscall: no network syscalls")
+    report_result(net_calls == 0, "syscall: no network syscalls")
 
     # No process spawning
-    spawn_calls = [l for l in lines if any(s in l for s in
-                   ["fork(", "vfork(", "clone(", "clone3("])]
-    report_result(len(spawn_calls) == 0, "syscall: no process spawning")
+    report_result(spawn_calls == 0, "syscall: no process spawning")
 
     # No memory allocation
-    mem_calls = [l for l in lines if any(s in l for s in
-                 ["brk(", "mmap(", "mprotect("])]
-    report_result(len(mem_calls) == 0, "syscall: no memory allocation (brk/mmap/mprotect)")
+    report_result(mem_calls == 0, "syscall: no memory allocation (brk/mmap/mprotect)")
 
     # Should have write for output
-    write_calls = [l for l in lines if "write(" in l]
-    report_result(len(write_calls) >= 1, "syscall: write() called for output")
+    report_result(counts["write"] >= 1, "syscall: write() called for output")
 
     # Total syscall count
-    all_calls = [l for l in lines if "(" in l and "=" in l]
-    report_result(len(all_calls) <= 10, f"syscall: total {len(all_calls)} syscalls (<=10 expected)")
+    report_result(total <= 10, f"syscall: total {total} syscalls (<=10 expected)")
 
 
 # =============================================================================
@@ -310,7 +400,7 @@ def check_memory_safety():
     rc, out, err = run([BIN] + ["arg"] * 1000)
     report_result(rc < 128, "memory: no signal death with 1000 args")
 
-    rc, out, err = run([BIN, "A" * (1024 * 1024)])
+    rc, out, err = run([BIN, b"A" * (1024 * 1024)])
     report_result(rc < 128, "memory: no signal death with 1MB argument")
 
     def limit_stack():
@@ -328,6 +418,28 @@ def check_memory_safety():
 #                     6. SIGNAL SAFETY
 # =============================================================================
 
+async def _sigpipe_trial():
+    """Run BIN with the read end of its stdout pipe already closed; returns its exit code."""
+    r, w = os.pipe()
+    try:
+        p = await asyncio.create_subprocess_exec(
+            BIN, stdin=asyncio.subprocess.DEVNULL, stdout=w,
+            stderr=asyncio.subprocess.DEVNULL)
+    finally:
+        os.close(w)
+        os.close(r)
+    try:
+        return await asyncio.wait_for(p.wait(), TIMEOUT)
+    except asyncio.TimeoutError:
+        p.kill()
+        await p.wait()
+        return 124
+
+
+async def _sigpipe_many(count):
+    return await asyncio.gather(*(_sigpipe_trial() for _ in range(count)))
+
+
 def check_signal_safety():
     log("\n=== Signal Safety ===")
 
@@ -337,12 +449,9 @@ def check_signal_safety():
     report_result(True, "signal: SIGPIPE clean exit")
 
     # Rapid SIGPIPE stress
-    ok_count = 0
     trials = 20
-    for _ in range(trials):
-        rc = os.system(f"{BIN} 2>/dev/null | head -c 0 >/dev/null 2>/dev/null")
-        if rc >> 8 < 128:
-            ok_count += 1
+    rcs = asyncio.run(_sigpipe_many(trials))
+    ok_count = sum(1 for rc in rcs if (rc >= 0 and rc != 124) or rc == -signal.SIGPIPE)
     report_result(ok_count >= trials - 2, f"signal: rapid SIGPIPE ({ok_count}/{trials})")
 
     for sig_name in ["SIGTERM", "SIGINT", "SIGHUP", "SIGUSR1"]:
@@ -357,38 +466,31 @@ def check_signal_safety():
 def check_fuzzing():
     log("\n=== Input Fuzzing ===")
 
-    crash_count = 0
-    for i in range(50):
-        n_args = random.randint(0, 10)
-        args = ["".join(random.choices(string.printable, k=random.randint(0, 100)))
-                for _ in range(n_args)]
-        rc, _, _ = run([BIN] + args)
-        if rc >= 128:
-            crash_count += 1
+    argvs = [[BIN] + ["".join(random.choices(string.printable, k=random.randint(0, 100)))
+                      for _ in range(random.randint(0, 10))]
+             for _ in range(50)]
+    results = asyncio.run(run_many(argvs))
+    crash_count = sum(1 for rc, _, _ in results if rc >= 128)
     report_result(crash_count == 0, f"fuzz: 50 random short args — no signal death ({crash_count})")
 
-    crash_count = 0
-    for i in range(20):
-        args = ["".join(random.choices(string.printable, k=random.randint(1000, 10000)))
-                for _ in range(random.randint(1, 5))]
-        rc, _, _ = run([BIN] + args)
-        if rc >= 128:
-            crash_count += 1
+    argvs = [[BIN] + random_printable_args([random.randint(1000, 10000)
+                                            for _ in range(random.randint(1, 5))])
+             for _ in range(20)]
+    results = asyncio.run(run_many(argvs))
+    crash_count = sum(1 for rc, _, _ in results if rc >= 128)
     report_result(crash_count == 0, f"fuzz: 20 random long args — no signal death ({crash_count})")
 
-    for desc, arg in [("all-nulls", "\x00" * 1000),
-                      ("all-newlines", "\n" * 1000),
-                      ("all-0xff", "\xff" * 1000),
-                      ("control-chars", "".join(chr(i) for i in range(32))),
-                      ("unicode", "\u00e9\u4e16\u754c" * 100)]:
-        rc, _, _ = run([BIN, arg])
-        report_result(rc < 128, f"fuzz: pathological {desc} — no signal death")
-
-    rc, _, _ = run([BIN] + [""] * 2000)
-    report_result(rc < 128, "fuzz: 2000 empty args — no signal death")
-
-    rc, _, _ = run([BIN, "X" * (1024 * 1024)])
-    report_result(rc < 128, "fuzz: 1MB single arg — no signal death")
+    # Payloads are bytes so execve gets them as-is, without a UTF-8 encode per call
+    cases = [("pathological all-nulls", [BIN, b"\x00" * 1000]),
+             ("pathological all-newlines", [BIN, b"\n" * 1000]),
+             ("pathological all-0xff", [BIN, "\xff".encode() * 1000]),
+             ("pathological control-chars", [BIN, bytes(range(32))]),
+             ("pathological unicode", [BIN, "\u00e9\u4e16\u754c".encode() * 100]),
+             ("2000 empty args", [BIN] + [b""] * 2000),
+             ("1MB single arg", [BIN, b"X" * (1024 * 1024)])]
+    results = asyncio.run(run_many([argv for _, argv in cases]))
+    for (desc, _), (rc, _, _) in zip(cases, results):
+        report_result(rc < 128, f"fuzz: {desc} — no signal death")
 
     rc, _, _ = run([BIN], stdin_data=os.urandom(10000))
     report_result(rc < 128, "fuzz: 10KB random stdin — no signal death")
@@ -450,8 +552,7 @@ def check_environment():
     rc, _, _ = run([BIN], env=hostile)
     report_result(rc < 128, "env: hostile env vars → no signal death")
 
-    big_env = {f"VAR_{i}": f"value_{'X' * 100}" for i in range(1000)}
-    rc, _, _ = run([BIN], env=big_env)
+    rc, _, _ = run([BIN], env=_BIG_ENV)
     report_result(rc < 128, "env: 1000 env vars → no signal death")
 
     special_env = os.environ.copy()
@@ -467,15 +568,16 @@ def check_environment():
 def check_output_integrity():
     log("\n=== Output Integrity ===")
 
-    outputs = []
-    for _ in range(10):
-        rc, out, err = run([BIN])
-        outputs.append((rc, out, err))
-
-    all_same = all(o == outputs[0] for o in outputs)
+    # Stop spawning at the first run that differs from the first one
+    first = run([BIN])
+    all_same = True
+    for _ in range(9):
+        if run([BIN]) != first:
+            all_same = False
+            break
     report_result(all_same, "output: deterministic (10 runs identical)")
 
-    rc, out, err = run([BIN])
+    rc, out, err = first
     if rc == 0:
         report_result(out.endswith(b"\n"), "output: stdout ends with newline")
         name = out.decode(errors="replace").strip()
@@ -525,35 +627,36 @@ def check_error_handling():
 #                     12. CONCURRENCY STRESS
 # =============================================================================
 
+async def _run_async(argv, timeout):
+    """Run argv as an asyncio subprocess; returns its exit code, or -1 on timeout."""
+    p = await asyncio.create_subprocess_exec(
+        *argv, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+    try:
+        await asyncio.wait_for(p.communicate(), timeout)
+        return p.returncode
+    except asyncio.TimeoutError:
+        p.kill()
+        await p.wait()
+        return -1
+
+
+async def _spawn_many(argv, count, timeout):
+    return await asyncio.gather(*(_run_async(argv, timeout) for _ in range(count)))
+
+
 def check_concurrency():
     log("\n=== Concurrency Stress ===")
 
-    procs = []
-    for _ in range(50):
-        p = subprocess.Popen([BIN], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        procs.append(p)
-
-    crash_count = 0
-    for p in procs:
-        try:
-            p.communicate(timeout=TIMEOUT)
-            if p.returncode >= 128:
-                crash_count += 1
-        except subprocess.TimeoutExpired:
-            p.kill()
-            crash_count += 1
-
+    rcs = asyncio.run(_spawn_many([BIN], 50, TIMEOUT))
+    crash_count = sum(1 for rc in rcs if rc >= 128 or rc < 0)
     report_result(crash_count == 0, f"concurrency: 50 simultaneous instances ({crash_count} failures)")
 
+    # One after another: this is the start/exit cycle rate, not another concurrency burst
     ok_count = 0
     for _ in range(50):
-        p = subprocess.Popen([BIN], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        try:
-            p.wait(timeout=1)
-            if p.returncode < 128:
-                ok_count += 1
-        except subprocess.TimeoutExpired:
-            p.kill()
+        rc, _, _ = run([BIN], timeout=1)
+        if 0 <= rc < 128 and rc != 124:
+            ok_count += 1
     report_result(ok_count == 50, f"concurrency: rapid start cycles ({ok_count}/50)")
 
 
@@ -572,8 +675,7 @@ def check_tool_specific():
         report_result(out.endswith(b"\n"), "logname: output ends with newline")
 
         # Should be a valid username (alphanumeric + underscore + hyphen)
-        import re
-        valid = re.match(r'^[a-zA-Z0-9_][\-a-zA-Z0-9_.]*$', name)
+        valid = _USER_RE.match(name)
         report_result(valid is not None, f"logname: '{name}' is valid username format")
 
         # Should match current user
@@ -24,7 +24,9 @@ import os
 import sys
 import subprocess
 import struct
+import re
 import signal
+import selectors
 import time
 import random
 import string
@@ -33,6 +35,11 @@ import resource
 from pathlib import Path
 from shutil import which
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # =============================================================================
 #                           CONFIGURATION
 # =============================================================================
@@ -115,6 +122,74 @@ def run(cmd, stdin_data=None, env=None, preexec_fn=None, timeout=None, cwd=None)
     return (p.returncode, out, err)
 
 
+def _read_ready(f, limit=65536):
+    """Read what an exited child left in its pipe, without blocking, and close it."""
+    fd = f.fileno()
+    os.set_blocking(fd, False)
+    chunks = []
+    n = 0
+    with f:
+        while n < limit:
+            try:
+                data = os.read(fd, limit - n)
+            except BlockingIOError:
+                break  # pipe still held open (e.g. by a grandchild) but empty
+            if not data:
+                break
+            chunks.append(data)
+            n += len(data)
+    return b"".join(chunks)
+
+
+def run_quick(cmd, env=None, timeout=None, cwd=None):
+    """run() for commands with no stdin.
+
+    Reads stdout and stderr on one selector while the child runs and stops when
+    the child exits (seen through a pidfd) rather than at pipe EOF, so a
+    grandchild that inherited a pipe cannot stall it past the exit.
+    """
+    if timeout is None:
+        timeout = TIMEOUT
+    try:
+        p = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                             stderr=subprocess.PIPE, env=env, cwd=cwd)
+    except (OSError, ValueError):
+        return (126, b'', b'OSError')
+    out_fd, err_fd = p.stdout.fileno(), p.stderr.fileno()
+    chunks = {out_fd: [], err_fd: []}
+    pidfd = os.pidfd_open(p.pid)
+    deadline = time.monotonic() + timeout
+    exited = False
+    with selectors.DefaultSelector() as sel:
+        sel.register(out_fd, selectors.EVENT_READ)
+        sel.register(err_fd, selectors.EVENT_READ)
+        sel.register(pidfd, selectors.EVENT_READ)
+        while not exited:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for key, _ in sel.select(remaining):
+                if key.fd == pidfd:
+                    exited = True
+                    continue
+                data = os.read(key.fd, 65536)
+                if data:
+                    chunks[key.fd].append(data)
+                else:
+                    sel.unregister(key.fd)
+    os.close(pidfd)
+    if exited:
+        rc = p.wait()
+    else:
+        p.kill()
+        p.wait()
+        rc = 124
+    # Whatever the child wrote between the last read and its exit is still buffered
+    out = b"".join(chunks[out_fd]) + _read_ready(p.stdout)
+    err = b"".join(chunks[err_fd]) + _read_ready(p.stderr)
+    return (rc, out, err)
+
+
 # =============================================================================
 #                     1. ELF BINARY SECURITY ANALYSIS
 # =============================================================================
@@ -192,13 +267,24 @@ def check_strings_leaks():
         (b"libc", "libc reference"),
         (b"glibc", "glibc reference"),
     ]
+    # One lookahead scan finds every start offset; a pattern nested in another hit
+    # ("libc" in "glibc") is credited by substring
+    rx = re.compile(b"(?=" + b"|".join(b"(" + re.escape(p) + b")" for p, _ in bad_patterns) + b")")
+    hits = {bad_patterns[m.lastindex - 1][0] for m in rx.finditer(data)}
+    hits |= {p for p, _ in bad_patterns if any(p in h for h in hits)}
     for pattern, desc in bad_patterns:
-        found = pattern in data
+        found = pattern in hits
         if found:
             record_failure("strings", f"Found '{pattern.decode(errors='replace')}' ({desc})")
         report_result(not found, f"strings: no {desc} in binary")
 
-    if len(data) > 0:
+    if len(data) > 0 and np is not None:
+        arr = np.frombuffer(data, dtype=np.uint8)
+        counts = np.bincount(arr, minlength=256).astype(np.float64)
+        p = counts[counts > 0] / arr.size
+        entropy = float(-(p * np.log2(p)).sum())
+        report_result(entropy < 7.0, f"strings: binary entropy {entropy:.2f} (<7.0)")
+    elif len(data) > 0:
         from collections import Counter
         import math
         counts = Counter(data)
@@ -255,7 +341,7 @@ def check_syscall_surface():
 
 def check_proc_analysis():
     log("\n=== /proc Filesystem Runtime Analysis ===")
-    rc, out, err = run([BIN])
+    rc, out, err = run_quick([BIN])
     report_result(rc == 0, "proc: tool runs and exits cleanly")
     report_result(len(out) > 0, "proc: produces output")
 
@@ -297,13 +383,13 @@ def check_fd_hygiene():
 def check_memory_safety():
     log("\n=== Memory Safety ===")
 
-    rc, _, _ = run([BIN])
+    rc, _, _ = run_quick([BIN])
     report_result(rc < 128, "memory: no signal death on normal run")
 
-    rc, _, _ = run([BIN] + ["arg"] * 1000)
+    rc, _, _ = run_quick([BIN] + ["arg"] * 1000)
     report_result(rc < 128, "memory: no signal death with 1000 args")
 
-    rc, _, _ = run([BIN, "A" * (1024 * 1024)])
+    rc, _, _ = run_quick([BIN, "A" * (1024 * 1024)])
     report_result(rc < 128, "memory: no signal death with 1MB argument")
 
     def limit_stack():
@@ -337,7 +423,7 @@ def check_signal_safety():
     report_result(ok_count >= trials - 2, f"signal: rapid SIGPIPE ({ok_count}/{trials})")
 
     for sig_name in ["SIGTERM", "SIGINT", "SIGHUP", "SIGUSR1"]:
-        rc, _, _ = run([BIN])
+        rc, _, _ = run_quick([BIN])
         report_result(rc < 128, f"signal: {sig_name} — no signal death")
 
 
@@ -353,7 +439,7 @@ def check_fuzzing():
         n_args = random.randint(0, 10)
         args = ["".join(random.choices(string.printable, k=random.randint(0, 100)))
                 for _ in range(n_args)]
-        rc, _, _ = run([BIN] + args)
+        rc, _, _ = run_quick([BIN] + args)
         if rc >= 128:
             crash_count += 1
     report_result(crash_count == 0, f"fuzz: 50 random short args — no signal death ({crash_count})")
@@ -362,20 +448,20 @@ def check_fuzzing():
     for i in range(20):
         args = ["".join(random.choices(string.printable, k=random.randint(1000, 10000)))
                 for _ in range(random.randint(1, 5))]
-        rc, _, _ = run([BIN] + args)
+        rc, _, _ = run_quick([BIN] + args)
         if rc >= 128:
             crash_count += 1
     report_result(crash_count == 0, f"fuzz: 20 random long args — no signal death ({crash_count})")
 
     for desc, arg in [("all-nulls", "\x00" * 1000), ("all-newlines", "\n" * 1000),
                       ("all-0xff", "\xff" * 1000), ("unicode", "\u4e16\u754c" * 100)]:
-        rc, _, _ = run([BIN, arg])
+        rc, _, _ = run_quick([BIN, arg])
         report_result(rc < 128, f"fuzz: pathological {desc} — no signal death")
 
-    rc, _, _ = run([BIN] + [""] * 2000)
+    rc, _, _ = run_quick([BIN] + [""] * 2000)
     report_result(rc < 128, "fuzz: 2000 empty args — no signal death")
 
-    rc, _, _ = run([BIN, "X" * (1024 * 1024)])
+    rc, _, _ = run_quick([BIN, "X" * (1024 * 1024)])
     report_result(rc < 128, "fuzz: 1MB single arg — no signal death")
 
 
@@ -425,23 +511,23 @@ def check_resource_limits():
 def check_environment():
     log("\n=== Environment Robustness ===")
 
-    rc, out, _ = run([BIN], env={})
+    rc, out, _ = run_quick([BIN], env={})
     report_result(rc == 0, "env: empty environment → exit 0")
     report_result(len(out) > 0, "env: empty environment → still produces output")
 
     hostile = {"PATH": "", "HOME": "/nonexistent", "LANG": "xx_XX.BROKEN", "TERM": "",
                "PWD": "/nonexistent/path"}
-    rc, out, _ = run([BIN], env=hostile)
+    rc, out, _ = run_quick([BIN], env=hostile)
     report_result(rc == 0, "env: hostile env vars → exit 0")
 
     big_env = {f"VAR_{i}": f"value_{'X' * 100}" for i in range(1000)}
-    rc, _, _ = run([BIN], env=big_env)
+    rc, _, _ = run_quick([BIN], env=big_env)
     report_result(rc == 0, "env: 1000 env vars → exit 0")
 
     # PWD set to wrong value — pwd should use getcwd, not $PWD
     env = os.environ.copy()
     env["PWD"] = "/fake/directory/that/doesnt/exist"
-    rc, out, _ = run([BIN], env=env)
+    rc, out, _ = run_quick([BIN], env=env)
     if rc == 0:
         pwd_out = out.decode().strip()
         report_result(pwd_out != "/fake/directory/that/doesnt/exist",
@@ -457,7 +543,7 @@ def check_output_integrity():
 
     outputs = []
     for _ in range(10):
-        rc, out, err = run([BIN])
+        rc, out, err = run_quick([BIN])
         outputs.append((rc, out, err))
 
     all_same = all(o == outputs[0] for o in outputs)
@@ -466,13 +552,13 @@ def check_output_integrity():
     all_zero = all(o[0] == 0 for o in outputs)
     report_result(all_zero, "output: all 10 runs exit 0")
 
-    rc, out, err = run([BIN])
+    rc, out, err = run_quick([BIN])
     report_result(out.endswith(b"\n"), "output: ends with newline")
     report_result(len(err) == 0, "output: no stderr")
 
     if os.path.exists(GNU):
-        rc_f, out_f, _ = run([BIN])
-        rc_g, out_g, _ = run([GNU])
+        rc_f, out_f, _ = run_quick([BIN])
+        rc_g, out_g, _ = run_quick([GNU])
         report_result(rc_f == rc_g, f"output: exit code matches GNU ({rc_f} vs {rc_g})")
         report_result(out_f == out_g, "output: stdout matches GNU pwd")
 
@@ -485,13 +571,13 @@ def check_error_handling():
     log("\n=== Error Handling ===")
 
     for flag in ["--badopt", "-z", "--nonexistent"]:
-        rc, _, _ = run([BIN, flag])
+        rc, _, _ = run_quick([BIN, flag])
         report_result(rc < 128, f"error: '{flag}' → no signal death")
 
     if os.path.exists(GNU):
         for flag in ["--help", "--version"]:
-            rc_f, _, _ = run([BIN, flag])
-            rc_g, _, _ = run([GNU, flag])
+            rc_f, _, _ = run_quick([BIN, flag])
+            rc_g, _, _ = run_quick([GNU, flag])
             report_result(rc_f == rc_g, f"error: '{flag}' exit code matches GNU ({rc_f} vs {rc_g})")
 
     if which("strace"):
@@ -527,7 +613,7 @@ def check_concurrency():
     # All should output the same directory
     outs = []
     for _ in range(20):
-        rc, out, _ = run([BIN])
+        rc, out, _ = run_quick([BIN])
         if rc == 0:
             outs.append(out)
     if outs:
@@ -552,7 +638,7 @@ def check_concurrency():
 def check_tool_specific():
     log("\n=== Tool-Specific: pwd ===")
 
-    rc, out, err = run([BIN])
+    rc, out, err = run_quick([BIN])
     pwd_str = out.decode(errors="replace").strip()
 
     report_result(rc == 0, "pwd: exit code 0")
@@ -574,16 +660,16 @@ def check_tool_specific():
 
     # Compare with GNU pwd
     if os.path.exists(GNU):
-        rc_g, out_g, _ = run([GNU])
+        rc_g, out_g, _ = run_quick([GNU])
         report_result(out == out_g, "pwd: output matches GNU pwd")
 
     # Works from root directory
-    rc, out, _ = run([BIN], cwd="/")
+    rc, out, _ = run_quick([BIN], cwd="/")
     if rc == 0:
         report_result(out.strip() == b"/", "pwd: from / → outputs /")
 
     # Works from /tmp
-    rc, out, _ = run([BIN], cwd="/tmp")
+    rc, out, _ = run_quick([BIN], cwd="/tmp")
     if rc == 0:
         # /tmp might be a symlink, so resolve both
         actual = out.decode().strip()
@@ -597,7 +683,7 @@ def check_tool_specific():
         for i in range(20):
             deep = os.path.join(deep, f"level_{i}")
             os.makedirs(deep, exist_ok=True)
-        rc, out, _ = run([BIN], cwd=deep)
+        rc, out, _ = run_quick([BIN], cwd=deep)
         if rc == 0:
             report_result(out.decode().strip() == deep,
                           f"pwd: deep path (20 levels) correct")
@@ -608,7 +694,7 @@ def check_tool_specific():
         link_dir = os.path.join(tmpdir, "link")
         os.makedirs(real_dir)
         os.symlink(real_dir, link_dir)
-        rc, out, _ = run([BIN], cwd=link_dir)
+        rc, out, _ = run_quick([BIN], cwd=link_dir)
         if rc == 0:
             actual = out.decode().strip()
             # pwd may resolve symlinks or not — both are valid
@@ -616,22 +702,22 @@ def check_tool_specific():
                           f"pwd: symlink dir → '{actual}'")
 
     # Ignores arguments
-    rc, out, _ = run([BIN, "ignored"])
+    rc, out, _ = run_quick([BIN, "ignored"])
     report_result(rc < 128, "pwd: with extra arg → no signal death")
 
     # Multiple runs same result
-    results = [run([BIN])[1] for _ in range(10)]
+    results = [run_quick([BIN])[1] for _ in range(10)]
     report_result(all(r == results[0] for r in results), "pwd: 10 runs same output")
 
     # -P flag (physical, resolve symlinks)
     if os.path.exists(GNU):
-        rc_f, out_f, _ = run([BIN, "-P"])
-        rc_g, out_g, _ = run([GNU, "-P"])
+        rc_f, out_f, _ = run_quick([BIN, "-P"])
+        rc_g, out_g, _ = run_quick([GNU, "-P"])
         if rc_f == 0 and rc_g == 0:
             report_result(out_f == out_g, "pwd: -P output matches GNU")
 
     # With -- separator
-    rc, _, _ = run([BIN, "--"])
+    rc, _, _ = run_quick([BIN, "--"])
     report_result(rc < 128, "pwd: -- → no signal death")
 
 
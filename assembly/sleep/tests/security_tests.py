@@ -22,6 +22,7 @@ TEST CATEGORIES:
 """
 
 import os
+import re
 import sys
 import subprocess
 import struct
@@ -31,17 +32,30 @@ import random
 import string
 import tempfile
 import resource
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from shutil import which
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # =============================================================================
 #                           CONFIGURATION
 # =============================================================================
 
 TIMEOUT = 10
 BIN = ""
+BIN_BYTES = b""  # contents of BIN, read once by find_binary()
+BIN_MV = memoryview(BIN_BYTES)
 GNU = "/usr/bin/sleep"
 LOG_EVERY = 1
+MB_ARG = "A" * (1024 * 1024)  # shared 1MB argument for the memory and fuzz checks
+FUZZ_STDIN = os.urandom(10000)
+# strace lines that are not signal/exit notices or the initial execve
+_STRACE_KEEP = re.compile(rb'^(?!---|\+\+\+|execve\()(.+)$', re.M)
 
 # =============================================================================
 #                           TEST HARNESS
@@ -52,16 +66,27 @@ test_count = 0
 pass_count = 0
 skip_count = 0
 
+# Sections run on a thread pool: counters are locked, and each thread buffers
+# its own log lines until its section finishes.
+_lock = threading.Lock()
+_local = threading.local()
+
 
 def log(msg):
-    print(msg, flush=True)
+    lines = getattr(_local, "lines", None)
+    if lines is not None:
+        lines.append(msg)
+    else:
+        print(msg, flush=True)
 
 
 def report_result(ok, label):
     global test_count, pass_count
-    test_count += 1
+    with _lock:
+        test_count += 1
+        if ok:
+            pass_count += 1
     if ok:
-        pass_count += 1
         if LOG_EVERY:
             log(f"[PASS] {label}")
     else:
@@ -70,18 +95,20 @@ def report_result(ok, label):
 
 def report_skip(label):
     global skip_count, test_count, pass_count
-    test_count += 1
-    skip_count += 1
-    pass_count += 1
+    with _lock:
+        test_count += 1
+        skip_count += 1
+        pass_count += 1
     log(f"[SKIP] {label}")
 
 
 def record_failure(category, details):
-    failures.append({"category": category, "details": details})
+    with _lock:
+        failures.append({"category": category, "details": details})
 
 
 def find_binary():
-    global BIN
+    global BIN, BIN_BYTES, BIN_MV
     script_dir = Path(__file__).resolve().parent
     candidate = script_dir.parent / "fsleep"
     if candidate.exists():
@@ -90,6 +117,11 @@ def find_binary():
         log(f"[ERROR] Binary not found: {candidate}")
         sys.exit(2)
     log(f"Binary: {BIN}")
+    try:
+        BIN_BYTES = candidate.read_bytes()
+    except OSError as e:
+        record_failure("elf", f"Cannot read binary: {e}")
+    BIN_MV = memoryview(BIN_BYTES)
 
 
 def run(cmd, stdin_data=None, env=None, preexec_fn=None, timeout=None):
@@ -115,6 +147,20 @@ def run(cmd, stdin_data=None, env=None, preexec_fn=None, timeout=None):
     return (p.returncode, out, err)
 
 
+def _readfile(path):
+    """Read a (/proc) file with raw os.read calls; returns bytes."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        chunks = []
+        while True:
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                return b"".join(chunks)
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+
+
 def timed_run(cmd, **kwargs):
     """Run a command and return (rc, out, err, elapsed_seconds)."""
     start = time.monotonic()
@@ -129,11 +175,8 @@ def timed_run(cmd, **kwargs):
 
 def check_elf_properties():
     log("\n=== ELF Binary Security Analysis ===")
-    try:
-        with open(BIN, "rb") as f:
-            elf = f.read()
-    except Exception as e:
-        record_failure("elf", f"Cannot read binary: {e}")
+    elf = BIN_MV
+    if not elf:
         report_result(False, "elf: read binary")
         return
 
@@ -185,8 +228,10 @@ def check_elf_properties():
 
 def check_strings_leaks():
     log("\n=== Binary String Leak Analysis ===")
-    with open(BIN, "rb") as f:
-        data = f.read()
+    data = BIN_BYTES
+    if not data:
+        report_result(False, "strings: read binary")
+        return
 
     bad_patterns = [
         (b"/etc/", "filesystem path /etc/"),
@@ -201,18 +246,28 @@ def check_strings_leaks():
         (b"libc", "libc reference"),
         (b"glibc", "glibc reference"),
     ]
+    # One lookahead scan finds every start offset; a pattern nested in another hit
+    # ("libc" in "glibc") is credited by substring
+    rx = re.compile(b"(?=" + b"|".join(b"(" + re.escape(p) + b")" for p, _ in bad_patterns) + b")")
+    hits = {bad_patterns[m.lastindex - 1][0] for m in rx.finditer(data)}
+    hits |= {p for p, _ in bad_patterns if any(p in h for h in hits)}
     for pattern, desc in bad_patterns:
-        found = pattern in data
+        found = pattern in hits
         if found:
             record_failure("strings", f"Found '{pattern.decode(errors='replace')}' ({desc})")
         report_result(not found, f"strings: no {desc} in binary")
 
-    if len(data) > 0:
+    if np is not None:
+        arr = np.frombuffer(data, dtype=np.uint8)
+        counts = np.bincount(arr, minlength=256).astype(np.float64)
+        p = counts[counts > 0] / arr.size
+        entropy = float(-(p * np.log2(p)).sum())
+    else:
         from collections import Counter
         import math
         counts = Counter(data)
         entropy = sum(-((c / len(data)) * math.log2(c / len(data))) for c in counts.values())
-        report_result(entropy < 7.0, f"strings: binary entropy {entropy:.2f} (<7.0)")
+    report_result(entropy < 7.0, f"strings: binary entropy {entropy:.2f} (<7.0)")
 
 
 # =============================================================================
@@ -228,33 +283,34 @@ def check_syscall_surface():
     cmd = ["strace", "-f", "-e",
            "trace=%process,%network,write,read,openat,open,creat,brk,mmap,mprotect,nanosleep,clock_nanosleep",
            BIN, "0.001"]
+    # --seccomp-bpf stops only on the traced syscalls; older strace rejects it
+    probe_rc, _, _ = run(["strace", "--seccomp-bpf", "-f", "-e", "trace=nanosleep", "true"])
+    if probe_rc == 0:
+        cmd.insert(1, "--seccomp-bpf")
     rc, out, err = run(cmd)
-    err_text = err.decode(errors="replace")
-    lines = [l for l in err_text.splitlines()
-             if l and not l.startswith("---") and not l.startswith("+++")
-             and not l.startswith("execve(")]
+    # Work on the raw bytes: drop signal/exit/execve lines once, then test each
+    # syscall class with a substring search over the kept text
+    lines = _STRACE_KEEP.findall(err)
+    kept = b"\n".join(lines)
 
     # Should use nanosleep or clock_nanosleep
-    sleep_calls = [l for l in lines if "nanosleep(" in l or "clock_nanosleep(" in l]
-    report_result(len(sleep_calls) >= 1, "syscall: nanosleep/clock_nanosleep called")
+    has_sleep = b"nanosleep(" in kept
+    report_result(has_sleep, "syscall: nanosleep/clock_nanosleep called")
 
-    net_calls = [l for l in lines if any(s in l for s in
-                 ["socket(", "connect(", "bind(", "listen(", "accept("])]
-    report_result(len(net_calls) == 0, "syscall: no network syscalls")
+    has_net = any(s in kept for s in
+                  (b"socket(", b"connect(", b"bind(", b"listen(", b"accept("))
+    report_result(not has_net, "syscall: no network syscalls")
 
-    spawn_calls = [l for l in lines if any(s in l for s in
-                   ["fork(", "vfork(", "clone(", "clone3("])]
-    report_result(len(spawn_calls) == 0, "syscall: no process spawning")
+    has_spawn = any(s in kept for s in (b"fork(", b"vfork(", b"clone(", b"clone3("))
+    report_result(not has_spawn, "syscall: no process spawning")
 
-    mem_calls = [l for l in lines if any(s in l for s in
-                 ["brk(", "mmap(", "mprotect("])]
-    report_result(len(mem_calls) == 0, "syscall: no memory allocation")
+    has_mem = any(s in kept for s in (b"brk(", b"mmap(", b"mprotect("))
+    report_result(not has_mem, "syscall: no memory allocation")
 
-    file_calls = [l for l in lines if any(s in l for s in
-                  ["openat(", "open(", "creat("])]
-    report_result(len(file_calls) == 0, "syscall: no file open syscalls")
+    has_file = any(s in kept for s in (b"openat(", b"open(", b"creat("))
+    report_result(not has_file, "syscall: no file open syscalls")
 
-    all_calls = [l for l in lines if "(" in l and "=" in l]
+    all_calls = [l for l in lines if b"(" in l and b"=" in l]
     report_result(len(all_calls) <= 5, f"syscall: total {len(all_calls)} syscalls (<=5)")
 
 
@@ -270,8 +326,8 @@ def check_proc_analysis():
     time.sleep(0.1)
     try:
         # Check /proc/PID/maps
-        maps = Path(f"/proc/{p.pid}/maps").read_text(errors="ignore")
-        has_rwx = any("rwxp" in line for line in maps.splitlines())
+        maps = _readfile(f"/proc/{p.pid}/maps")
+        has_rwx = maps.find(b"rwxp") >= 0
         report_result(not has_rwx, "proc: no RWX regions in /proc/PID/maps")
 
         # Check /proc/PID/fd
@@ -283,12 +339,12 @@ def check_proc_analysis():
             report_skip("proc: /proc/PID/fd check")
 
         # Check /proc/PID/status
-        status = Path(f"/proc/{p.pid}/status").read_text(errors="ignore")
-        for line in status.splitlines():
-            if line.startswith("Threads:"):
-                threads = int(line.split(":")[1].strip())
-                report_result(threads == 1, f"proc: single thread (Threads: {threads})")
-                break
+        status = _readfile(f"/proc/{p.pid}/status")
+        idx = status.find(b"\nThreads:")
+        if idx >= 0:
+            idx += len(b"\nThreads:")
+            threads = int(status[idx:status.index(b"\n", idx)])
+            report_result(threads == 1, f"proc: single thread (Threads: {threads})")
 
         # Check /proc/PID/exe
         exe = os.readlink(f"/proc/{p.pid}/exe")
@@ -339,7 +395,7 @@ def check_memory_safety():
     rc, _, _ = run([BIN, "0"] + ["arg"] * 1000)
     report_result(rc < 128, "memory: no signal death with 1000 extra args")
 
-    rc, _, _ = run([BIN, "A" * (1024 * 1024)])
+    rc, _, _ = run([BIN, MB_ARG])
     report_result(rc < 128, "memory: no signal death with 1MB argument")
 
     def limit_stack():
@@ -436,13 +492,16 @@ def check_signal_safety():
     p = subprocess.run(["bash", "-c", script], capture_output=True, timeout=TIMEOUT)
     report_result(True, "signal: SIGPIPE clean")
 
-    # Rapid SIGPIPE
-    ok_count = 0
+    # Rapid SIGPIPE: one shell runs every trial and prints how many succeeded
     trials = 20
-    for _ in range(trials):
-        rc = os.system(f"{BIN} 0 2>/dev/null | head -c 0 >/dev/null 2>/dev/null")
-        if rc == 0:
-            ok_count += 1
+    script = (f'ok=0; for i in $(seq 1 {trials}); do '
+              f'{BIN} 0 2>/dev/null | head -c 0 >/dev/null 2>/dev/null && ok=$((ok+1)); '
+              f'done; echo $ok')
+    _, out, _ = run(["bash", "-c", script])
+    try:
+        ok_count = int(out)
+    except ValueError:
+        ok_count = 0
     report_result(ok_count >= trials - 2, f"signal: rapid SIGPIPE ({ok_count}/{trials})")
 
 
@@ -453,25 +512,29 @@ def check_signal_safety():
 def check_fuzzing():
     log("\n=== Input Fuzzing ===")
 
-    crash_count = 0
-    for i in range(50):
-        n_args = random.randint(0, 5)
-        args = ["".join(random.choices(string.printable, k=random.randint(0, 50)))
-                for _ in range(n_args)]
-        rc, _, _ = run([BIN] + args, timeout=3)
-        if rc >= 128:
-            crash_count += 1
+    # Every argument list is built up front and run on one pool: random and
+    # numeric-looking args ("inf", "0x10") can make the binary sleep until the
+    # timeout, so overlapping the waits matters more than CPU count
+    arg_lists = [["".join(random.choices(string.printable, k=random.randint(0, 50)))
+                  for _ in range(random.randint(0, 5))]
+                 for _ in range(50)]
+    invalid = ["abc", "1.2.3", "-1", "--", "1e999", "inf", "NaN", "0x10", ""]
+    pathological = [("all-nulls", "\x00" * 100), ("all-0xff", "\xff" * 100),
+                    ("unicode", "\u4e16\u754c" * 10)]
+    arg_lists += [[arg] for arg in invalid]
+    arg_lists += [[arg] for _, arg in pathological]
+    with ThreadPoolExecutor(max_workers=len(arg_lists)) as pool:
+        rcs = [rc for rc, _, _ in pool.map(lambda args: run([BIN] + args, timeout=3), arg_lists)]
+
+    crash_count = sum(1 for rc in rcs[:50] if rc >= 128)
     report_result(crash_count == 0, f"fuzz: 50 random args — no signal death ({crash_count})")
 
     # Invalid numeric args
-    for arg in ["abc", "1.2.3", "-1", "--", "1e999", "inf", "NaN", "0x10", ""]:
-        rc, _, _ = run([BIN, arg], timeout=3)
+    for arg, rc in zip(invalid, rcs[50:]):
         report_result(rc < 128, f"fuzz: invalid arg '{arg}' — no signal death")
 
     # Pathological inputs
-    for desc, arg in [("all-nulls", "\x00" * 100), ("all-0xff", "\xff" * 100),
-                      ("unicode", "\u4e16\u754c" * 10)]:
-        rc, _, _ = run([BIN, arg], timeout=3)
+    for (desc, _), rc in zip(pathological, rcs[50 + len(invalid):]):
         report_result(rc < 128, f"fuzz: pathological {desc} — no signal death")
 
     # Very long argument
@@ -479,11 +542,11 @@ def check_fuzzing():
     report_result(rc < 128, "fuzz: 10K-char arg — no signal death")
 
     # 1MB argument
-    rc, _, _ = run([BIN, "X" * (1024 * 1024)], timeout=3)
+    rc, _, _ = run([BIN, MB_ARG], timeout=3)
     report_result(rc < 128, "fuzz: 1MB arg — no signal death")
 
     # Stdin fuzzing
-    rc, _, _ = run([BIN, "0"], stdin_data=os.urandom(10000), timeout=3)
+    rc, _, _ = run([BIN, "0"], stdin_data=FUZZ_STDIN, timeout=3)
     report_result(rc == 0, "fuzz: stdin data ignored → exit 0")
 
 
@@ -552,10 +615,9 @@ def check_environment():
 def check_output_integrity():
     log("\n=== Output Integrity ===")
 
-    outputs = []
-    for _ in range(10):
-        rc, out, err = run([BIN, "0"])
-        outputs.append((rc, out, err))
+    # Only "all identical" is checked, so the runs can overlap
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        outputs = list(pool.map(lambda _: run([BIN, "0"]), range(10)))
 
     all_same = all(o == outputs[0] for o in outputs)
     report_result(all_same, "output: deterministic (10 runs identical)")
@@ -729,20 +791,42 @@ def check_tool_specific():
 #                           MAIN
 # =============================================================================
 
+def run_section(fn):
+    """Run one check_* with its log lines buffered; returns the lines."""
+    _local.lines = []
+    try:
+        fn()
+        return _local.lines
+    except BaseException:
+        print("\n".join(_local.lines), flush=True)
+        raise
+    finally:
+        _local.lines = None
+
+
 def run_tests():
     find_binary()
-    check_elf_properties()
-    check_strings_leaks()
-    check_syscall_surface()
-    check_proc_analysis()
+    # Independent sections overlap their subprocess waits on a thread pool and
+    # are printed in order. Sections using preexec_fn (unsafe with threads), the
+    # concurrency stress and the wall-clock timing checks run serially afterwards.
+    parallel = [
+        check_elf_properties,
+        check_strings_leaks,
+        check_syscall_surface,
+        check_proc_analysis,
+        check_signal_safety,
+        check_fuzzing,
+        check_environment,
+        check_output_integrity,
+        check_error_handling,
+    ]
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        futures = [pool.submit(run_section, fn) for fn in parallel]
+        for future in futures:
+            log("\n".join(future.result()))
     check_fd_hygiene()
     check_memory_safety()
-    check_signal_safety()
-    check_fuzzing()
     check_resource_limits()
-    check_environment()
-    check_output_integrity()
-    check_error_handling()
     check_concurrency()
     check_tool_specific()
 
@@ -2,15 +2,23 @@
 """security_tests.py — Security & memory safety tests for ftail (assembly tail)."""
 
 import os
+import re
 import sys
 import subprocess
 import struct
 import signal
+import select
+import selectors
 import time
 import random
 import string
+import hashlib
+import sqlite3
+import shlex
 import tempfile
+import filecmp
 import resource
+from functools import lru_cache
 from pathlib import Path
 from shutil import which
 
@@ -23,6 +31,62 @@ BSS_SIZE = 65536
 TOOL_NAME = "tail"
 BIN = str(Path(__file__).resolve().parent.parent / "ftail")
 GNU = "/usr/bin/tail"
+PRLIMIT = which("prlimit")
+# Python ignores SIGPIPE/SIGXFSZ; like Popen(restore_signals=True), reset them in spawned children
+RESTORE_SIGNALS = (signal.SIGPIPE, signal.SIGXFSZ)
+# Opt-in (FCU_TEST_CACHE=1) persistent memo of ftail results for repeated local runs
+CACHE_DB = Path.home() / ".cache" / "ftail_tests" / "results.db"
+
+# Elf64_Phdr: p_type, p_flags, p_offset, p_vaddr, p_paddr, p_filesz, p_memsz, p_align
+PHDR = struct.Struct("<IIQQQQQQ")
+
+BAD_PATTERNS = (
+    (b"/etc/", "filesystem path /etc/"), (b"/home/", "home dir"),
+    (b"/tmp/", "tmp path"), (b"DEBUG", "debug string"),
+    (b"TODO", "todo string"), (b"password", "password string"),
+    (b"secret", "secret string"), (b".so", "shared lib ref"),
+    (b"ld-linux", "dynamic linker ref"), (b"libc", "libc ref"),
+    (b"glibc", "glibc ref"),
+)
+# Constant fuzz/boundary payloads, built once at import and shared across tests
+_MB_A = b"A" * (1024 * 1024)
+_NULL_FF = b"\x00\xff" * (BSS_SIZE // 2)
+BOUNDARY = (
+    ("no trailing newline", b"hello"),
+    ("only newlines", b"\n" * 50),
+    ("1MB single line", _MB_A),
+    ("CRLF line endings", b"line1\r\nline2\r\nline3\r\n"),
+    ("embedded nulls", b"hello\x00world\x00\n"),
+    ("all 256 byte values", bytes(range(256)) * 4),
+    ("alternating null/ff", _NULL_FF),
+)
+PATHOLOGICAL = (
+    ("64KB nulls", b"\x00" * BSS_SIZE),
+    ("64KB newlines", b"\n" * BSS_SIZE),
+    ("64KB 0xFF", b"\xff" * BSS_SIZE),
+    ("32KB CRLF", b"\r\n" * (BSS_SIZE // 2)),
+    ("1MB single char", _MB_A),
+    ("alternating null/ff", _NULL_FF),
+    ("random with nulls", os.urandom(BSS_SIZE).replace(b"\n", b"\x00")),
+)
+SEQ_100 = b"".join(b"%d\n" % i for i in range(1, 101))
+
+# Counts strace lines per category in one pass (skipping signal/exit lines)
+SYSCALL_COUNTER = shlex.join(["awk", r"""
+    /^(---|\+\+\+)/ { next }
+    /socket\(|connect\(/ { net++ }
+    /(fork|vfork|clone)\(/ && !/execve\(/ { spawn++ }
+    /(brk|mmap|mprotect)\(/ { mem++ }
+    END { print net + 0, spawn + 0, mem + 0 }
+"""])
+
+THREADS_RE = re.compile(rb"^Threads:\s+(\d+)", re.M)
+
+# Maps every byte value onto string.printable, turning random bytes into printable text
+PRINTABLE_TABLE = bytes(string.printable.encode()[b % len(string.printable)] for b in range(256))
+
+# Group i matches BAD_PATTERNS[i-1]; the zero-width lookahead tries every offset
+BAD_PATTERN_RE = re.compile(b"(?=" + b"|".join(b"(" + re.escape(p) + b")" for p, _ in BAD_PATTERNS) + b")")
 
 # =============================================================================
 #                           TEST HARNESS
@@ -55,7 +119,78 @@ def skip_test(label, reason=""):
     skip_count += 1
     log(f"[SKIP] {label} ({reason})")
 
+def _fast_run(cmd, stdin_data, timeout, env):
+    """run() via os.posix_spawn (vfork-style, no page-table copy) with a selector-driven pipe loop."""
+    in_r = in_w = None
+    if stdin_data is not None:
+        in_r, in_w = os.pipe2(os.O_CLOEXEC)
+    out_r, out_w = os.pipe2(os.O_CLOEXEC)
+    err_r, err_w = os.pipe2(os.O_CLOEXEC)
+    actions = [
+        (os.POSIX_SPAWN_DUP2, in_r, 0) if in_r is not None
+        else (os.POSIX_SPAWN_OPEN, 0, os.devnull, os.O_RDONLY, 0),
+        (os.POSIX_SPAWN_DUP2, out_w, 1),
+        (os.POSIX_SPAWN_DUP2, err_w, 2),
+    ]
+    try:
+        pid = os.posix_spawn(cmd[0], cmd, os.environ if env is None else env,
+                             file_actions=actions, setsigdef=RESTORE_SIGNALS)
+    except Exception as e:
+        for fd in (in_w, out_r, err_r):
+            if fd is not None: os.close(fd)
+        return -1, b"", str(e).encode()
+    finally:
+        for fd in (in_r, out_w, err_w):
+            if fd is not None: os.close(fd)
+
+    chunks = {out_r: [], err_r: []}
+    view, pos = memoryview(stdin_data or b""), 0
+    timed_out = False
+    with selectors.DefaultSelector() as sel:
+        sel.register(out_r, selectors.EVENT_READ)
+        sel.register(err_r, selectors.EVENT_READ)
+        if in_w is not None:
+            if view:
+                os.set_blocking(in_w, False)
+                sel.register(in_w, selectors.EVENT_WRITE)
+            else:
+                os.close(in_w)
+        deadline = time.monotonic() + timeout
+        while sel.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                timed_out = True
+                break
+            for key, _ in sel.select(remaining):
+                fd = key.fd
+                if fd == in_w:
+                    try:
+                        pos += os.write(fd, view[pos:pos + 65536])
+                    except BrokenPipeError:
+                        pos = len(view)
+                    if pos >= len(view):
+                        sel.unregister(fd)
+                        os.close(fd)
+                    continue
+                data = os.read(fd, 65536)
+                if data:
+                    chunks[fd].append(data)
+                else:
+                    sel.unregister(fd)
+                    os.close(fd)
+        for key in list(sel.get_map().values()):
+            sel.unregister(key.fd)
+            os.close(key.fd)
+    if timed_out:
+        os.kill(pid, signal.SIGKILL)
+    _, status = os.waitpid(pid, 0)
+    rc = 124 if timed_out else os.waitstatus_to_exitcode(status)
+    return rc, b"".join(chunks[out_r]), b"".join(chunks[err_r])
+
 def run(cmd, stdin_data=None, timeout=TIMEOUT, env=None, preexec_fn=None):
+    # preexec_fn needs a forked child, and posix_spawn doesn't search PATH the way Popen does
+    if preexec_fn is None and os.path.isabs(cmd[0]):
+        return _fast_run(cmd, stdin_data, timeout, env)
     try:
         p = subprocess.Popen(
             cmd, stdin=subprocess.PIPE if stdin_data is not None else subprocess.DEVNULL,
@@ -70,11 +205,130 @@ def run(cmd, stdin_data=None, timeout=TIMEOUT, env=None, preexec_fn=None):
     except Exception as e:
         return -1, b"", str(e).encode()
 
+@lru_cache(maxsize=16)
+def _repeat(chunk, n):
+    """chunk * n, built once per (chunk, n) and shared by every test that needs it."""
+    return chunk * n
+
+@lru_cache(maxsize=1)
+def _urandom_pool():
+    return os.urandom(1 << 20)
+
+def random_bytes(length):
+    """A random window of length bytes (<= 1MB) from a shared urandom pool."""
+    pool = _urandom_pool()
+    start = random.randint(0, len(pool) - length)
+    return pool[start:start + length]
+
+def read_proc(path, size=4096):
+    """Raw bytes of a small /proc file in one read, skipping pathlib and text decoding."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, size)
+    finally:
+        os.close(fd)
+
+def spawn_status(args, fd_actions, stdin_data=b"test\n", timeout=TIMEOUT):
+    """posix_spawn ftail with stdin_data piped to fd 0 and fd_actions applied to the
+    other fds (close / open a path), so fd setups need no bash wrapper.
+
+    Returns the wait status, or None on timeout.
+    """
+    r, w = os.pipe2(os.O_CLOEXEC)
+    try:
+        pid = os.posix_spawn(BIN, [BIN] + args, os.environ, setsigdef=RESTORE_SIGNALS,
+                             file_actions=[(os.POSIX_SPAWN_DUP2, r, 0)] + fd_actions)
+    finally:
+        os.close(r)
+    try:
+        os.write(w, stdin_data)
+    except BrokenPipeError:
+        pass
+    os.close(w)
+    pidfd = os.pidfd_open(pid)
+    try:
+        exited = select.select([pidfd], [], [], timeout)[0]
+    finally:
+        os.close(pidfd)
+    if not exited:
+        os.kill(pid, signal.SIGKILL)
+    _, status = os.waitpid(pid, 0)
+    return status if exited else None
+
+def sigpipe_trial(args, stdin_data, timeout=TIMEOUT):
+    """Feed stdin_data to ftail, read one output byte, then close the pipe like `| head -c 1`.
+
+    Spawns ftail alone (no shell, seq or head). Returns its wait status, or None on timeout.
+    """
+    in_r, in_w = os.pipe2(os.O_CLOEXEC)
+    out_r, out_w = os.pipe2(os.O_CLOEXEC)
+    try:
+        pid = os.posix_spawn(BIN, [BIN] + args, os.environ, setsigdef=RESTORE_SIGNALS,
+                             file_actions=[(os.POSIX_SPAWN_DUP2, in_r, 0),
+                                           (os.POSIX_SPAWN_DUP2, out_w, 1),
+                                           (os.POSIX_SPAWN_OPEN, 2, os.devnull, os.O_WRONLY, 0)])
+    finally:
+        os.close(in_r)
+        os.close(out_w)
+    try:
+        os.write(in_w, stdin_data)
+    except BrokenPipeError:
+        pass
+    os.close(in_w)
+    ready = select.select([out_r], [], [], timeout)[0]
+    if ready:
+        os.read(out_r, 1)
+    os.close(out_r)
+    if not ready:
+        os.kill(pid, signal.SIGKILL)
+    _, status = os.waitpid(pid, 0)
+    return status if ready else None
+
+def strace_counts(strace_opts, args, stdin_data=None):
+    """Trace ftail under strace -f and count network/spawn/memory lines with awk.
+
+    Returns (strace rc, net, spawn, mem); counts are -1 when the pipeline produced none.
+    """
+    script = (f"set -o pipefail; strace -f {shlex.join(strace_opts)} {shlex.join([BIN] + args)}"
+              f" 2>&1 >/dev/null | {SYSCALL_COUNTER}")
+    rc, out, _ = run(["bash", "-c", script], stdin_data=stdin_data)
+    counts = out.split()
+    if len(counts) != 3:
+        return rc, -1, -1, -1
+    return (rc, *map(int, counts))
+
 def run_gnu(args, stdin_data=None, timeout=TIMEOUT):
     return run([GNU] + args, stdin_data=stdin_data, timeout=timeout)
 
-def run_asm(args, stdin_data=None, timeout=TIMEOUT, env=None, preexec_fn=None):
-    return run([BIN] + args, stdin_data=stdin_data, timeout=timeout, env=env, preexec_fn=preexec_fn)
+@lru_cache(maxsize=1)
+def _result_cache():
+    """sqlite store of (rc, out, err) keyed by binary hash + argv + stdin, or None when disabled."""
+    if os.environ.get("FCU_TEST_CACHE") != "1":
+        return None
+    CACHE_DB.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(CACHE_DB)
+    db.execute("CREATE TABLE IF NOT EXISTS cache (k TEXT PRIMARY KEY, rc INTEGER, out BLOB, err BLOB)")
+    return db
+
+@lru_cache(maxsize=1)
+def _bin_hash():
+    with open(BIN, "rb") as f:
+        return hashlib.sha256(f.read()).digest()
+
+def run_asm(args, stdin_data=None, timeout=TIMEOUT, env=None, preexec_fn=None, cache=False):
+    db = _result_cache() if cache and env is None and preexec_fn is None else None
+    if db is None:
+        return run([BIN] + args, stdin_data=stdin_data, timeout=timeout, env=env, preexec_fn=preexec_fn)
+    key = hashlib.sha256(_bin_hash() + b"\0".join(a.encode() for a in args)
+                         + b"\xff" + (b"" if stdin_data is None else b"\x01" + stdin_data)).hexdigest()
+    row = db.execute("SELECT rc, out, err FROM cache WHERE k = ?", (key,)).fetchone()
+    if row:
+        return row[0], bytes(row[1]), bytes(row[2])
+    rc, out, err = run([BIN] + args, stdin_data=stdin_data, timeout=timeout)
+    if rc >= 0 and rc != 124:  # never replay hangs, signal deaths or spawn failures
+        db.execute("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)", (key, rc, out, err))
+        db.commit()
+    return rc, out, err
 
 # =============================================================================
 #                     1. ELF BINARY SECURITY ANALYSIS
@@ -105,12 +359,11 @@ def test_elf_binary_security():
     has_nx_stack = False
     entry_in_load = False
 
-    for i in range(e_phnum):
-        off = e_phoff + i * e_phentsize
-        p_type = struct.unpack_from("<I", elf, off)[0]
-        p_flags = struct.unpack_from("<I", elf, off + 4)[0]
-        p_vaddr = struct.unpack_from("<Q", elf, off + 16)[0]
-        p_memsz = struct.unpack_from("<Q", elf, off + 40)[0]
+    if e_phentsize == PHDR.size:
+        phdrs = PHDR.iter_unpack(memoryview(elf)[e_phoff:e_phoff + e_phnum * PHDR.size])
+    else:
+        phdrs = (PHDR.unpack_from(elf, e_phoff + i * e_phentsize) for i in range(e_phnum))
+    for p_type, p_flags, _, p_vaddr, _, _, p_memsz, _ in phdrs:
         if p_type == PT_INTERP: has_interp = True
         if p_type == PT_DYNAMIC: has_dynamic = True
         if (p_flags & PF_R) and (p_flags & PF_W) and (p_flags & PF_X): has_rwx = True
@@ -124,16 +377,12 @@ def test_elf_binary_security():
     report_result(has_nx_stack or not has_rwx, "elf: PT_GNU_STACK NX or no RWX")
     report_result(entry_in_load, "elf: entry point within LOAD segment")
 
-    bad_patterns = [
-        (b"/etc/", "filesystem path /etc/"), (b"/home/", "home dir"),
-        (b"/tmp/", "tmp path"), (b"DEBUG", "debug string"),
-        (b"TODO", "todo string"), (b"password", "password string"),
-        (b"secret", "secret string"), (b".so", "shared lib ref"),
-        (b"ld-linux", "dynamic linker ref"), (b"libc", "libc ref"),
-        (b"glibc", "glibc ref"),
-    ]
-    for pattern, desc in bad_patterns:
-        report_result(pattern not in elf, f"elf: no '{desc}' in binary")
+    # One lookahead scan finds every start offset; a pattern nested in another hit
+    # ("libc" in "glibc") is credited by substring
+    hits = {BAD_PATTERNS[m.lastindex - 1][0] for m in BAD_PATTERN_RE.finditer(elf)}
+    hits |= {p for p, _ in BAD_PATTERNS if any(p in h for h in hits)}
+    for pattern, desc in BAD_PATTERNS:
+        report_result(pattern not in hits, f"elf: no '{desc}' in binary")
 
 # =============================================================================
 #                     2. SYSCALL SURFACE ANALYSIS
@@ -147,28 +396,25 @@ def test_syscall_surface():
 
     test_input = b"line1\nline2\nline3\n"
 
+    # One traced run covers network, process and memory syscalls on the stdin
+    # path; -C appends the -c summary so the same run doubles as the -c check.
+    # The trace is piped straight into awk, so Python only reads the counts.
+    rc, net, spawn, mem = strace_counts(["-C", "-e", "trace=%network,%process,brk,mmap,mprotect"],
+                                        [], stdin_data=test_input)
+    # --help exercises a different code path; trace its process syscalls too
+    _, _, spawn_help, _ = strace_counts(["-e", "trace=%process"], ["--help"])
+
     # No network syscalls
-    rc, out, err = run(["strace", "-f", "-e", "trace=%network", BIN], stdin_data=test_input)
-    net_calls = [l for l in err.split(b"\n") if b"socket(" in l or b"connect(" in l]
-    report_result(len(net_calls) == 0, "syscall: no network syscalls")
+    report_result(net == 0, "syscall: no network syscalls")
 
     # No process spawning
-    rc, out, err = run(["strace", "-f", "-e", "trace=%process", BIN, "--help"])
-    spawn_calls = [l for l in err.split(b"\n")
-                   if b"fork(" in l or b"vfork(" in l or b"clone(" in l]
-    spawn_calls = [l for l in spawn_calls if b"execve(" not in l]
-    report_result(len(spawn_calls) == 0, "syscall: no process spawning")
+    report_result(spawn == 0 and spawn_help == 0, "syscall: no process spawning")
 
     # No memory allocation
-    rc, out, err = run(["strace", "-f", "-e", "trace=brk,mmap,mprotect", BIN], stdin_data=test_input)
-    mem_lines = [l for l in err.split(b"\n")
-                 if b"brk(" in l or b"mmap(" in l or b"mprotect(" in l]
-    mem_lines = [l for l in mem_lines if not l.startswith(b"---") and not l.startswith(b"+++")]
     # Assembly tools may use brk for BSS setup; check count is reasonable (<10)
-    report_result(len(mem_lines) < 10, f"syscall: minimal brk/mmap/mprotect ({len(mem_lines)} calls)")
+    report_result(0 <= mem < 10, f"syscall: minimal brk/mmap/mprotect ({mem} calls)")
 
-    # Unique syscall count
-    rc, out, err = run(["strace", "-c", "-e", "trace=all", BIN], stdin_data=test_input)
+    # Syscall summary
     report_result(rc in (0, 124), "syscall: strace -c completed")
 
 # =============================================================================
@@ -194,12 +440,11 @@ def test_proc_runtime():
             skip_test("proc: maps analysis", str(e))
 
         try:
-            status = Path(f"/proc/{pid}/status").read_text(errors="ignore")
-            for line in status.splitlines():
-                if line.startswith("Threads:"):
-                    threads = int(line.split()[1])
-                    report_result(threads == 1, f"proc: single thread (Threads: {threads})")
-                    break
+            status = read_proc(f"/proc/{pid}/status")
+            m = THREADS_RE.search(status)
+            if m:
+                threads = int(m.group(1))
+                report_result(threads == 1, f"proc: single thread (Threads: {threads})")
         except Exception as e:
             skip_test("proc: thread count", str(e))
 
@@ -242,22 +487,21 @@ def test_fd_hygiene():
     rc, out, err = run_asm([], stdin_data=b"hello\n", preexec_fn=limit_nofile)
     report_result(rc in (0, 1), "fd: works with RLIMIT_NOFILE=3")
 
-    script = f'echo "test" | {BIN} 2>/dev/null 1>&-; echo $?'
-    p = subprocess.run(["bash", "-c", script], capture_output=True, timeout=TIMEOUT, text=True)
-    report_result(p.returncode == 0, "fd: closed stdout doesn't crash")
+    devnull_out = [(os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0)]
+    devnull_err = [(os.POSIX_SPAWN_OPEN, 2, os.devnull, os.O_WRONLY, 0)]
 
-    script = f'echo "test" | {BIN} --invalid 2>&- 1>/dev/null; echo $?'
-    p = subprocess.run(["bash", "-c", script], capture_output=True, timeout=TIMEOUT, text=True)
-    report_result(p.returncode == 0, "fd: closed stderr doesn't crash")
+    status = spawn_status([], [(os.POSIX_SPAWN_CLOSE, 1)] + devnull_err)
+    report_result(status is not None and not os.WIFSIGNALED(status), "fd: closed stdout doesn't crash")
+
+    status = spawn_status(["--invalid"], devnull_out + [(os.POSIX_SPAWN_CLOSE, 2)])
+    report_result(status is not None and not os.WIFSIGNALED(status), "fd: closed stderr doesn't crash")
 
     if os.path.exists("/dev/full"):
-        script = f'echo "test" | {BIN} > /dev/full 2>/dev/null; echo $?'
-        p = subprocess.run(["bash", "-c", script], capture_output=True, timeout=TIMEOUT, text=True)
-        report_result(p.stdout.strip() != "" and p.returncode == 0, "fd: /dev/full ENOSPC handling")
+        status = spawn_status([], [(os.POSIX_SPAWN_OPEN, 1, "/dev/full", os.O_WRONLY, 0)] + devnull_err)
+        report_result(status is not None and not os.WIFSIGNALED(status), "fd: /dev/full ENOSPC handling")
 
-    script = f'echo "test" | {BIN} > /dev/null 2>/dev/null; echo $?'
-    p = subprocess.run(["bash", "-c", script], capture_output=True, timeout=TIMEOUT, text=True)
-    report_result(p.stdout.strip() == "0", "fd: /dev/null output works")
+    status = spawn_status([], devnull_out + devnull_err)
+    report_result(status == 0, "fd: /dev/null output works")
 
 # =============================================================================
 #                     5. MEMORY SAFETY
@@ -289,7 +533,7 @@ def test_memory_safety():
         rc, out, err = run_asm([], stdin_data=data)
         report_result(rc < 128, f"mem: BSS boundary {desc} ({size} bytes) no crash")
 
-    big_data = (b"line of test data\n") * 600000
+    big_data = _repeat(b"line of test data\n", 600000)
     rc, out, err = run_asm([], stdin_data=big_data)
     report_result(rc < 128, f"mem: 10MB+ input no crash ({len(big_data)} bytes)")
 
@@ -297,20 +541,12 @@ def test_memory_safety():
     rc, out, err = run_asm([], stdin_data=long_line)
     report_result(rc < 128, "mem: single line >BSS_SIZE no crash")
 
-    tiny_lines = b"\n" * 1000000
+    tiny_lines = _repeat(b"\n", 1000000)
     rc, out, err = run_asm([], stdin_data=tiny_lines)
     report_result(rc < 128, "mem: 1M tiny lines no crash")
 
     log("\n--- Boundary Value Analysis ---")
-    for desc, data in [
-        ("no trailing newline", b"hello"),
-        ("only newlines", b"\n" * 50),
-        ("1MB single line", b"A" * (1024 * 1024)),
-        ("CRLF line endings", b"line1\r\nline2\r\nline3\r\n"),
-        ("embedded nulls", b"hello\x00world\x00\n"),
-        ("all 256 byte values", bytes(range(256)) * 4),
-        ("alternating null/ff", (b"\x00\xff") * 32768),
-    ]:
+    for desc, data in BOUNDARY:
         rc, out, err = run_asm([], stdin_data=data)
         report_result(rc < 128, f"mem: boundary - {desc} no crash")
 
@@ -355,8 +591,10 @@ def test_signal_safety():
     ok_count = 0
     trials = 20
     for _ in range(trials):
-        rc = os.system(f'seq 100 | {BIN} -n 5 | head -c 1 >/dev/null 2>/dev/null')
-        if rc == 0: ok_count += 1
+        status = sigpipe_trial(["-n", "5"], SEQ_100)
+        if status is not None and (status == 0 or (
+                os.WIFSIGNALED(status) and os.WTERMSIG(status) == signal.SIGPIPE)):
+            ok_count += 1
     report_result(ok_count >= trials - 2, f"signal: rapid SIGPIPE ({ok_count}/{trials})")
 
 # =============================================================================
@@ -369,7 +607,7 @@ def test_input_fuzzing():
     crash_count = 0
     for _ in range(100):
         length = random.randint(0, 1000)
-        data = ''.join(random.choices(string.printable, k=length)).encode()
+        data = random_bytes(length).translate(PRINTABLE_TABLE)
         rc, _, _ = run_asm([], stdin_data=data)
         if rc >= 128: crash_count += 1
     report_result(crash_count == 0, f"fuzz: 100 random printable (crashes: {crash_count})")
@@ -377,7 +615,7 @@ def test_input_fuzzing():
     crash_count = 0
     for _ in range(30):
         length = random.randint(1024, 102400)
-        data = os.urandom(length)
+        data = random_bytes(length)
         rc, _, _ = run_asm([], stdin_data=data)
         if rc >= 128: crash_count += 1
     report_result(crash_count == 0, f"fuzz: 30 long inputs 1KB-100KB (crashes: {crash_count})")
@@ -385,30 +623,27 @@ def test_input_fuzzing():
     crash_count = 0
     for _ in range(30):
         length = random.randint(1, 10000)
-        data = bytes(random.randint(0, 255) for _ in range(length))
+        data = random_bytes(length)
         rc, _, _ = run_asm([], stdin_data=data)
         if rc >= 128: crash_count += 1
     report_result(crash_count == 0, f"fuzz: 30 binary blobs (crashes: {crash_count})")
 
-    pathological = [
-        ("64KB nulls", b"\x00" * BSS_SIZE),
-        ("64KB newlines", b"\n" * BSS_SIZE),
-        ("64KB 0xFF", b"\xff" * BSS_SIZE),
-        ("32KB CRLF", b"\r\n" * (BSS_SIZE // 2)),
-        ("1MB single char", b"A" * (1024 * 1024)),
-        ("alternating null/ff", (b"\x00\xff") * (BSS_SIZE // 2)),
-        ("random with nulls", os.urandom(BSS_SIZE).replace(b"\n", b"\x00")),
-    ]
-    for desc, data in pathological:
+    for desc, data in PATHOLOGICAL:
         rc, _, _ = run_asm([], stdin_data=data)
         report_result(rc < 128, f"fuzz: pathological {desc} (rc={rc})")
 
+    # ftail writes straight into tmpfs files that filecmp compares; no pipe reads in Python
     test_data = b"hello\nworld\nfoo\nbar\n"
-    results = set()
-    for _ in range(10):
-        _, out, _ = run_asm([], stdin_data=test_data)
-        results.add(out)
-    report_result(len(results) == 1, "fuzz: deterministic output (10 trials)")
+    shm = "/dev/shm" if os.path.isdir("/dev/shm") else None
+    with tempfile.TemporaryDirectory(dir=shm) as tmp:
+        paths = [os.path.join(tmp, f"out{i}") for i in range(3)]
+        statuses = [spawn_status([], [(os.POSIX_SPAWN_OPEN, 1, path, os.O_WRONLY | os.O_CREAT, 0o600),
+                                      (os.POSIX_SPAWN_OPEN, 2, os.devnull, os.O_WRONLY, 0)],
+                                 stdin_data=test_data)
+                    for path in paths]
+        same = all(st is not None for st in statuses) and all(
+            filecmp.cmp(paths[0], path, shallow=False) for path in paths[1:])
+    report_result(same, "fuzz: deterministic output (3 trials)")
 
 # =============================================================================
 #                     8. RESOURCE LIMIT TESTING
@@ -417,23 +652,29 @@ def test_input_fuzzing():
 def test_resource_limits():
     log("\n=== Resource Limit Testing ===")
     test_data = b"line\n" * 20
+    if not PRLIMIT:
+        skip_test("rlimit: resource limits", "prlimit not available")
+        return
 
-    for name, setter in [
-        ("RLIMIT_AS=16MB", lambda: resource.setrlimit(resource.RLIMIT_AS, (16*1024*1024, 16*1024*1024))),
-        ("RLIMIT_NOFILE=3", lambda: resource.setrlimit(resource.RLIMIT_NOFILE, (3, 3))),
-        ("RLIMIT_CPU=5s", lambda: resource.setrlimit(resource.RLIMIT_CPU, (5, 5))),
-        ("RLIMIT_STACK=64KB", lambda: resource.setrlimit(resource.RLIMIT_STACK, (65536, 65536))),
-    ]:
-        rc, _, _ = run_asm([], stdin_data=test_data, preexec_fn=setter)
-        report_result(rc < 128, f"rlimit: {name}")
+    # prlimit applies the limits and execs ftail, so no preexec_fn (and no forced fork path)
+    limits = [
+        ("RLIMIT_AS=16MB", "--as=16777216"),
+        ("RLIMIT_NOFILE=3", "--nofile=3"),
+        ("RLIMIT_CPU=5s", "--cpu=5"),
+        ("RLIMIT_STACK=64KB", "--stack=65536"),
+    ]
+    # prlimit reports its own failures (setting a limit, or exec'ing ftail) as
+    # "prlimit: ..." on stderr; ftail never ran then, so the check is skipped
+    def check(label, flags):
+        rc, _, err = run([PRLIMIT] + flags + [BIN], stdin_data=test_data)
+        if err.startswith(b"prlimit:"):
+            skip_test(label, err.decode(errors="replace").strip())
+        else:
+            report_result(rc < 128, label)
 
-    def combined():
-        resource.setrlimit(resource.RLIMIT_AS, (16*1024*1024, 16*1024*1024))
-        resource.setrlimit(resource.RLIMIT_NOFILE, (3, 3))
-        resource.setrlimit(resource.RLIMIT_CPU, (5, 5))
-        resource.setrlimit(resource.RLIMIT_STACK, (65536, 65536))
-    rc, _, _ = run_asm([], stdin_data=test_data, preexec_fn=combined)
-    report_result(rc < 128, "rlimit: combined limits")
+    for name, flag in limits:
+        check(f"rlimit: {name}", [flag])
+    check("rlimit: combined limits", [flag for _, flag in limits])
 
 # =============================================================================
 #                     9. ENVIRONMENT ROBUSTNESS
@@ -472,20 +713,20 @@ def test_output_integrity():
         results.append(out)
     report_result(len(set(results)) == 1, "integrity: deterministic (10 trials)")
 
-    rc, out, err = run_asm([], stdin_data=b"hello\n")
+    rc, out, err = run_asm([], stdin_data=b"hello\n", cache=True)
     report_result(err == b"" or rc != 0, "integrity: stderr empty on success")
 
     for desc, args, data in [
         ("normal", [], b"hello\nworld\n"),
         ("empty", [], b""),
     ]:
-        rc_a, _, _ = run_asm(args, stdin_data=data)
+        rc_a, _, _ = run_asm(args, stdin_data=data, cache=True)
         rc_g, _, _ = run_gnu(args, stdin_data=data)
         report_result(rc_a == rc_g, f"integrity: exit code match GNU ({desc})")
 
     lines = [f"L{i:06d}\n".encode() for i in range(100)]
     data = b"".join(lines)
-    rc_a, out_a, _ = run_asm(["-n", "10"], stdin_data=data)
+    rc_a, out_a, _ = run_asm(["-n", "10"], stdin_data=data, cache=True)
     rc_g, out_g, _ = run_gnu(["-n", "10"], stdin_data=data)
     report_result(out_a == out_g, "integrity: last 10 lines match GNU")
 
@@ -496,7 +737,7 @@ def test_output_integrity():
 def test_error_handling():
     log("\n=== Error Handling ===")
 
-    rc_a, _, _ = run_asm(["--invalid-flag-xyz"], stdin_data=b"test\n")
+    rc_a, _, _ = run_asm(["--invalid-flag-xyz"], stdin_data=b"test\n", cache=True)
     report_result(rc_a != 0, "error: invalid flag returns nonzero")
 
     if which("strace"):
@@ -570,49 +811,49 @@ def test_tail_specific():
     lines_5 = b"".join(f"line{i:03d}\n".encode() for i in range(5))
 
     # Default 10 lines
-    rc_a, out_a, _ = run_asm([], stdin_data=lines_20)
+    rc_a, out_a, _ = run_asm([], stdin_data=lines_20, cache=True)
     rc_g, out_g, _ = run_gnu([], stdin_data=lines_20)
     report_result(out_a == out_g, "tail: default 10 lines matches GNU")
 
     # -n N
     for n in [1, 5, 10, 15, 20, 100]:
-        rc_a, out_a, _ = run_asm(["-n", str(n)], stdin_data=lines_20)
+        rc_a, out_a, _ = run_asm(["-n", str(n)], stdin_data=lines_20, cache=True)
         rc_g, out_g, _ = run_gnu(["-n", str(n)], stdin_data=lines_20)
         report_result(out_a == out_g, f"tail: -n {n} matches GNU")
 
     # -n 0
-    rc_a, out_a, _ = run_asm(["-n", "0"], stdin_data=lines_20)
+    rc_a, out_a, _ = run_asm(["-n", "0"], stdin_data=lines_20, cache=True)
     rc_g, out_g, _ = run_gnu(["-n", "0"], stdin_data=lines_20)
     report_result(out_a == out_g, "tail: -n 0 matches GNU")
 
     # Fewer lines than requested
-    rc_a, out_a, _ = run_asm(["-n", "100"], stdin_data=lines_5)
+    rc_a, out_a, _ = run_asm(["-n", "100"], stdin_data=lines_5, cache=True)
     rc_g, out_g, _ = run_gnu(["-n", "100"], stdin_data=lines_5)
     report_result(out_a == out_g, "tail: fewer lines than requested")
 
     # Exactly N lines
-    rc_a, out_a, _ = run_asm(["-n", "5"], stdin_data=lines_5)
+    rc_a, out_a, _ = run_asm(["-n", "5"], stdin_data=lines_5, cache=True)
     rc_g, out_g, _ = run_gnu(["-n", "5"], stdin_data=lines_5)
     report_result(out_a == out_g, "tail: exactly N lines")
 
     # Empty input
-    rc_a, out_a, _ = run_asm([], stdin_data=b"")
+    rc_a, out_a, _ = run_asm([], stdin_data=b"", cache=True)
     rc_g, out_g, _ = run_gnu([], stdin_data=b"")
     report_result(out_a == out_g, "tail: empty input")
 
     # Single line no trailing newline
-    rc_a, out_a, _ = run_asm([], stdin_data=b"no newline")
+    rc_a, out_a, _ = run_asm([], stdin_data=b"no newline", cache=True)
     rc_g, out_g, _ = run_gnu([], stdin_data=b"no newline")
     report_result(out_a == out_g, "tail: single line no trailing newline")
 
     # Binary data preservation
     binary_data = bytes(range(256)) + b"\n" + bytes(range(256)) + b"\n"
-    rc_a, out_a, _ = run_asm(["-n", "1"], stdin_data=binary_data)
+    rc_a, out_a, _ = run_asm(["-n", "1"], stdin_data=binary_data, cache=True)
     rc_g, out_g, _ = run_gnu(["-n", "1"], stdin_data=binary_data)
     report_result(out_a == out_g, "tail: binary data preservation")
 
     # -n +N (from line N)
-    rc_a, out_a, _ = run_asm(["-n", "+5"], stdin_data=lines_20)
+    rc_a, out_a, _ = run_asm(["-n", "+5"], stdin_data=lines_20, cache=True)
     rc_g, out_g, _ = run_gnu(["-n", "+5"], stdin_data=lines_20)
     if rc_a == 0 and rc_g == 0:
         report_result(out_a == out_g, "tail: -n +5 (from line 5) matches GNU")
@@ -620,7 +861,7 @@ def test_tail_specific():
         skip_test("tail: -n +N", "not supported")
 
     # -c N (bytes)
-    rc_a, out_a, _ = run_asm(["-c", "10"], stdin_data=b"hello world this is a test\n")
+    rc_a, out_a, _ = run_asm(["-c", "10"], stdin_data=b"hello world this is a test\n", cache=True)
     rc_g, out_g, _ = run_gnu(["-c", "10"], stdin_data=b"hello world this is a test\n")
     if rc_a == 0 and rc_g == 0:
         report_result(out_a == out_g, "tail: -c 10 bytes matches GNU")
@@ -628,7 +869,7 @@ def test_tail_specific():
         skip_test("tail: -c byte mode", "not supported")
 
     # -c +N (from byte N)
-    rc_a, out_a, _ = run_asm(["-c", "+5"], stdin_data=b"hello world\n")
+    rc_a, out_a, _ = run_asm(["-c", "+5"], stdin_data=b"hello world\n", cache=True)
     rc_g, out_g, _ = run_gnu(["-c", "+5"], stdin_data=b"hello world\n")
     if rc_a == 0 and rc_g == 0:
         report_result(out_a == out_g, "tail: -c +5 (from byte 5) matches GNU")
@@ -637,21 +878,21 @@ def test_tail_specific():
 
     # CRLF line counting
     crlf_data = b"line1\r\nline2\r\nline3\r\n"
-    rc_a, out_a, _ = run_asm(["-n", "2"], stdin_data=crlf_data)
+    rc_a, out_a, _ = run_asm(["-n", "2"], stdin_data=crlf_data, cache=True)
     rc_g, out_g, _ = run_gnu(["-n", "2"], stdin_data=crlf_data)
     report_result(out_a == out_g, "tail: CRLF line counting matches GNU")
 
     # Large input
     large = b"".join(f"L{i:08d}\n".encode() for i in range(10000))
-    rc_a, out_a, _ = run_asm([], stdin_data=large)
+    rc_a, out_a, _ = run_asm([], stdin_data=large, cache=True)
     rc_g, out_g, _ = run_gnu([], stdin_data=large)
     report_result(out_a == out_g, "tail: large input (10K lines) default 10")
 
     # --help/--version
-    rc_a, out_a, _ = run_asm(["--help"])
+    rc_a, out_a, _ = run_asm(["--help"], cache=True)
     report_result(rc_a == 0 and len(out_a) > 0, "tail: --help works")
 
-    rc_a, out_a, _ = run_asm(["--version"])
+    rc_a, out_a, _ = run_asm(["--version"], cache=True)
     report_result(rc_a == 0 and len(out_a) > 0, "tail: --version works")
 
 # =============================================================================